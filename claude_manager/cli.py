@@ -4,18 +4,48 @@ from __future__ import annotations
 
 import logging
 import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 import click
-from rich.console import Console
-from rich.logging import RichHandler
 
 from claude_manager import __version__
 from claude_manager.config import ClaudeConfigManager
 from claude_manager.terminal_utils import safe_terminal, check_terminal_compatibility, immediate_terminal_reset
-from claude_manager.tui import run_tui
-from claude_manager.utils import SignalHandler
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# rich and the textual TUI stack are imported on first use so that
+# short-lived invocations such as --version and --help start quickly;
+# those function-level imports are marked noqa: PLC0415.
+
+
+@lru_cache(maxsize=None)
+def get_console() -> Console:
+    """Get the shared console, importing rich on first use."""
+    from rich.console import Console  # noqa: PLC0415
+
+    return Console()
+
+
+def __getattr__(name: str) -> Console:
+    """Expose the lazily created console as the ``console`` module attribute."""
+    if name == "console":
+        return get_console()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def run_tui(config_manager: ClaudeConfigManager) -> None:
+    """Run the TUI application, importing it on first use.
+
+    Args:
+        config_manager: Loaded configuration manager
+    """
+    from claude_manager.tui import run_tui as _run_tui  # noqa: PLC0415
+
+    _run_tui(config_manager)
 
 
 def setup_logging(debug: bool = False) -> None:
@@ -24,6 +54,8 @@ def setup_logging(debug: bool = False) -> None:
     Args:
         debug: Whether to enable debug logging
     """
+    from rich.logging import RichHandler  # noqa: PLC0415
+
     level = logging.DEBUG if debug else logging.INFO
     logging.basicConfig(
         level=level,
@@ -83,6 +115,9 @@ def main(config_path: str | None, no_backup: bool, debug: bool, reset_terminal:
         # Enable debug logging
         claude-manager --debug
     """
+    from claude_manager.utils import SignalHandler  # noqa: PLC0415
+
+    console = get_console()
     setup_logging(debug)
     logging.getLogger(__name__)
 
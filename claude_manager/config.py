@@ -2,19 +2,166 @@
 
 from __future__ import annotations
 
+import array
+import hashlib
 import json
 import logging
+import mmap
+import os
+import re
 import shutil
-import yaml
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Iterable
 
 from claude_manager.models import Agent, Project
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 
+# Below this many changed agent files a thread pool costs more than it saves
+_PARALLEL_PARSE_MIN_FILES = 4
+_PARALLEL_PARSE_MAX_WORKERS = 8
+
+_FRONTMATTER_CHUNK = 64 * 1024
+_FRONTMATTER_OPEN = re.compile(rb"---\r?\n")
+_FRONTMATTER_CLOSE = re.compile(rb"\r?\n---")
+_FRONTMATTER_KEY = re.compile(r"[A-Za-z_][\w-]*")
+_YAML_BOOLS = {
+    "true": True,
+    "True": True,
+    "TRUE": True,
+    "false": False,
+    "False": False,
+    "FALSE": False,
+}
+# Plain scalars that YAML would turn into something other than a string
+_YAML_SPECIAL = {"yes", "no", "on", "off", "y", "n", "null", "~"}
+
+
+def _digest(data: bytes | memoryview) -> bytes:
+    """Hash configuration bytes for change detection."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _read_frontmatter(file_path: Path) -> str | None:
+    """Read the ``---`` delimited frontmatter at the top of a markdown file.
+
+    Reads in chunks and stops at the closing delimiter instead of loading
+    the (possibly large) body.
+
+    Args:
+        file_path: Path to the markdown file
+
+    Returns:
+        Frontmatter text between the delimiter lines, or None if the file has none
+    """
+    with open(file_path, "rb") as f:
+        buf = f.read(_FRONTMATTER_CHUNK)
+        opening = _FRONTMATTER_OPEN.match(buf)
+        if opening is None:
+            return None
+        start = opening.end()
+        # Begin at the opening newline so an empty block still closes
+        search_from = start - 1
+        while True:
+            closing = _FRONTMATTER_CLOSE.search(buf, search_from)
+            if closing is not None:
+                return buf[start : closing.start()].decode("utf-8")
+            chunk = f.read(_FRONTMATTER_CHUNK)
+            if not chunk:
+                return None
+            # The delimiter may straddle the chunk boundary
+            search_from = max(start - 1, len(buf) - 4)
+            buf += chunk
+
+
+def _load_yaml_frontmatter(text: str, file_path: Path) -> Any:
+    """Load frontmatter with PyYAML, imported on first use.
+
+    Uses libyaml's CSafeLoader when PyYAML was built with it.
+
+    Args:
+        text: Frontmatter text between the ``---`` markers
+        file_path: Agent file the frontmatter came from, for logging
+
+    Returns:
+        Parsed YAML document, or None if it is invalid
+    """
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        return yaml.load(text, Loader=loader)  # noqa: S506
+    except yaml.YAMLError as e:
+        logger.warning(f"Error parsing YAML frontmatter in {file_path}: {e}")
+        return None
+
+
+def _parse_flat_scalar(value: str) -> Any:
+    """Parse a plain YAML scalar, or raise ValueError if it isn't trivially a str/bool."""
+    if value in _YAML_BOOLS:
+        return _YAML_BOOLS[value]
+    if (
+        not value
+        or value[0] in "-+.0123456789'\"[]{}|>&*!%@`#?:,"
+        or value.lower() in _YAML_SPECIAL
+        or ": " in value
+        or " #" in value
+        or value.endswith(":")
+    ):
+        raise ValueError(value)
+    return value
+
+
+def _parse_flat_frontmatter(text: str) -> dict[str, Any] | None:
+    """Parse flat ``key: value`` frontmatter without a YAML parser.
+
+    Handles the subset agent files use: plain strings, booleans and inline
+    lists of plain strings. Returns None when anything else shows up so the
+    caller can fall back to a real YAML load.
+
+    Args:
+        text: Frontmatter text between the ``---`` markers
+
+    Returns:
+        Parsed mapping, or None if the frontmatter isn't flat
+    """
+    result: dict[str, Any] = {}
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if raw_line[0] in " \t":
+            return None
+        key, sep, value = line.partition(":")
+        if not sep or not _FRONTMATTER_KEY.fullmatch(key):
+            return None
+        value = value.strip()
+        try:
+            if value.startswith("[") and value.endswith("]"):
+                inner = value[1:-1].strip()
+                result[key] = (
+                    [_parse_flat_scalar(item.strip()) for item in inner.split(",")]
+                    if inner
+                    else []
+                )
+            else:
+                result[key] = _parse_flat_scalar(value)
+        except ValueError:
+            return None
+    return result
+
+
 class ClaudeConfigManager:
     """Manages Claude Code configuration file operations."""
 
@@ -26,9 +173,40 @@ class ClaudeConfigManager:
         """
         self.config_path = Path(config_path) if config_path else Path.home() / ".claude.json"
         self.config_data: dict[str, Any] = {}
+        self._projects_cache: dict[str, Project] | None = None
+        self._dirty = True
+        # Per-project columns for get_stats: (paths, history counts, MCP server counts)
+        self._project_columns: tuple[list[str], array.array[int], array.array[int]] | None = None
+        self._backups: deque[Path] | None = None
+        # (st_mtime_ns, st_size, digest) of the config file as last read or written
+        self._disk_state: tuple[int, int, bytes] | None = None
+        # (digest, path) of the most recent backup this manager wrote
+        self._last_backup: tuple[bytes, Path] | None = None
+        # (file path, agent type) -> (st_mtime_ns, st_size, parsed agent)
+        self._agent_cache: dict[tuple[str, str], tuple[int, int, Agent | None]] = {}
         self.backup_dir = Path.home() / ".claude_backups"
         self.backup_dir.mkdir(exist_ok=True)
 
+    @classmethod
+    def from_mapping(
+        cls, config_data: dict[str, Any], config_path: str | None = None
+    ) -> ClaudeConfigManager:
+        """Create a manager around already-parsed configuration data.
+
+        Nothing is read from disk; the mapping is used as-is (not copied) and
+        is only written to config_path by a later save_config.
+
+        Args:
+            config_data: Parsed configuration, as load_config would produce
+            config_path: Path to the configuration file. Defaults to ~/.claude.json
+
+        Returns:
+            ClaudeConfigManager holding config_data
+        """
+        manager = cls(config_path)
+        manager.config_data = config_data
+        return manager
+
     def load_config(self) -> bool:
         """Load the Claude configuration file.
 
@@ -40,8 +218,15 @@ class ClaudeConfigManager:
                 logger.error(f"Configuration file not found at {self.config_path}")
                 return False
 
-            with open(self.config_path, encoding="utf-8") as f:
-                self.config_data = json.load(f)
+            self._dirty = True
+            self._project_columns = None
+            with open(self.config_path, "rb") as f:
+                if orjson is not None and os.fstat(f.fileno()).st_size > 0:
+                    self._load_mapped(f)
+                else:
+                    raw = f.read()
+                    self.config_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                    self._remember_disk_state(raw)
 
             # Validate that config_data is a dictionary
             if not isinstance(self.config_data, dict):
@@ -59,6 +244,27 @@ class ClaudeConfigManager:
             logger.exception(f"Error loading config: {e}")
             return False
 
+    def _load_mapped(self, f: BinaryIO) -> None:
+        """Parse the configuration straight out of a read-only memory map.
+
+        orjson reads the mapped pages directly, so no bytes copy of the file
+        is made. Falls back to a buffered read if the file can't be mapped.
+
+        Args:
+            f: Configuration file opened in binary mode
+        """
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            raw = f.read()
+            self.config_data = orjson.loads(raw)
+            self._remember_disk_state(raw)
+            return
+
+        with mm, memoryview(mm) as view:
+            self.config_data = orjson.loads(view)
+            self._remember_disk_state(view)
+
     def save_config(self, create_backup: bool = True) -> bool:
         """Save the configuration with optional backup.
 
@@ -68,34 +274,91 @@ class ClaudeConfigManager:
         Returns:
             True if successful, False otherwise
         """
+        temp_path: Path | None = None
         try:
-            if create_backup:
-                self.create_backup()
-
             # Write to temporary file first
-            temp_path = self.config_path.with_suffix(".tmp")
-            with open(temp_path, "w", encoding="utf-8") as f:
-                json.dump(self.config_data, f, indent=2)
-
-            # Validate the temp file
-            with open(temp_path, encoding="utf-8") as f:
-                json.load(f)
+            if orjson is not None:
+                data = orjson.dumps(
+                    self.config_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+                )
+            else:
+                data = json.dumps(self.config_data, indent=2).encode("utf-8")
+
+            # Nothing changed since the last load/save: the file already
+            # holds these bytes, so there is nothing to write or back up
+            if self._is_on_disk(data):
+                logger.debug(f"Configuration unchanged, not rewriting {self.config_path}")
+                return True
+
+            temp_path = self._write_temp_file(data)
+
+            # The old config inode is about to be orphaned by Path.replace, so
+            # the backup can simply hardlink it instead of copying
+            if create_backup:
+                self._create_backup(link=True)
 
-            # Move temp file to actual location
-            shutil.move(str(temp_path), str(self.config_path))
+            # Atomically swap the temp file into place (single rename)
+            temp_path.replace(self.config_path)
+            self._remember_disk_state(data)
 
             logger.info(f"Saved configuration to {self.config_path}")
             return True
 
         except Exception as e:
             logger.exception(f"Error saving config: {e}")
-            if temp_path.exists():
+            if temp_path is not None and temp_path.exists():
                 temp_path.unlink()
             return False
 
+    def _write_temp_file(self, data: bytes) -> Path:
+        """Write data to a new temporary file next to the config file.
+
+        The file is created with O_EXCL and owner-only permissions, so a
+        concurrent save can never truncate it and the OAuth details in the
+        config are never briefly world-readable. If the usual ``.tmp`` name
+        is taken, a per-process unique name is used instead.
+
+        Args:
+            data: Serialized configuration
+
+        Returns:
+            Path of the fully written and fsynced temporary file
+        """
+        temp_path = self.config_path.with_suffix(".tmp")
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+        try:
+            fd = os.open(temp_path, flags, 0o600)
+        except FileExistsError:
+            temp_path = self.config_path.with_suffix(f".tmp.{os.getpid()}.{time.time_ns()}")
+            fd = os.open(temp_path, flags, 0o600)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        return temp_path
+
     def create_backup(self) -> Path | None:
         """Create a timestamped backup of the current configuration.
 
+        Returns:
+            Path to the backup file if successful, None otherwise
+        """
+        return self._create_backup(link=False)
+
+    def _create_backup(self, link: bool) -> Path | None:
+        """Create a timestamped backup of the current configuration.
+
+        Args:
+            link: Hardlink the config instead of copying it. Only safe right
+                before the config is replaced with Path.replace; otherwise an
+                in-place write by another program would alter the backup too.
+
         Returns:
             Path to the backup file if successful, None otherwise
         """
@@ -103,11 +366,32 @@ class ClaudeConfigManager:
             if not self.config_path.exists():
                 return None
 
+            # Load the backup list before writing so the new file isn't globbed twice
+            backups = self._get_backup_list()
+
+            # Skip the copy if the config hasn't changed since the last backup
+            # and that backup is still there
+            digest = self._config_digest()
+            if self._last_backup is not None:
+                last_digest, last_path = self._last_backup
+                if digest == last_digest and last_path.exists():
+                    logger.debug(f"Configuration unchanged since backup {last_path}")
+                    return last_path
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")  # noqa: DTZ005
             backup_path = self.backup_dir / f"claude_{timestamp}.json"
 
-            shutil.copy2(self.config_path, backup_path)
+            if link:
+                try:
+                    os.link(self.config_path, backup_path)
+                except OSError:
+                    # Cross-device or unsupported filesystem
+                    shutil.copy2(self.config_path, backup_path)
+            else:
+                shutil.copy2(self.config_path, backup_path)
             logger.info(f"Created backup at {backup_path}")
+            backups.append(backup_path)
+            self._last_backup = (digest, backup_path)
 
             # Clean old backups (keep last 10)
             self._clean_old_backups()
@@ -118,17 +402,81 @@ class ClaudeConfigManager:
             logger.exception(f"Error creating backup: {e}")
             return None
 
+    def _remember_disk_state(self, data: bytes | memoryview) -> None:
+        """Record the digest of the bytes just read from or written to the config file.
+
+        Args:
+            data: Exact contents of the configuration file
+        """
+        st = self.config_path.stat()
+        self._disk_state = (st.st_mtime_ns, st.st_size, _digest(data))
+
+    def _config_digest(self) -> bytes:
+        """Get the digest of the configuration file as it is on disk.
+
+        Reuses the digest recorded on the last load/save unless the file has
+        been touched since, in which case it is re-hashed.
+
+        Returns:
+            BLAKE2b digest of the file contents
+        """
+        st = self.config_path.stat()
+        if self._disk_state is not None and self._disk_state[:2] == (
+            st.st_mtime_ns,
+            st.st_size,
+        ):
+            return self._disk_state[2]
+        return _digest(self.config_path.read_bytes())
+
+    def _is_on_disk(self, data: bytes) -> bool:
+        """Check whether the config file already contains exactly these bytes.
+
+        Only files this manager has loaded or saved are compared; anything
+        else (including a missing file) counts as different.
+
+        Args:
+            data: Serialized configuration
+
+        Returns:
+            True if writing data would leave the file unchanged
+        """
+        if self._disk_state is None or len(data) != self._disk_state[1]:
+            return False
+        try:
+            return self._config_digest() == _digest(data)
+        except OSError:
+            return False
+
     def _clean_old_backups(self, keep_count: int = 10) -> None:
         """Keep only the most recent backups.
 
         Args:
             keep_count: Number of backups to keep
         """
-        backups = sorted(self.backup_dir.glob("claude_*.json"))
-        if len(backups) > keep_count:
-            for backup in backups[:-keep_count]:
-                backup.unlink()
-                logger.debug(f"Removed old backup: {backup}")
+        backups = self._get_backup_list()
+        stale = [backups.popleft() for _ in range(len(backups) - keep_count)]
+        for backup in stale:
+            backup.unlink(missing_ok=True)
+            logger.debug(f"Removed old backup: {backup}")
+
+    def _get_backup_list(self) -> deque[Path]:
+        """Get the in-process list of backups, oldest first.
+
+        The backup directory is scanned once; afterwards the list is kept in
+        sync by create_backup, delete_backup and _clean_old_backups.
+
+        Returns:
+            Deque of backup file paths sorted by name (i.e. by timestamp)
+        """
+        if self._backups is None:
+            with os.scandir(self.backup_dir) as entries:
+                names = sorted(
+                    entry.name
+                    for entry in entries
+                    if entry.name.startswith("claude_") and entry.name.endswith(".json")
+                )
+            self._backups = deque(self.backup_dir / name for name in names)
+        return self._backups
 
     def get_projects(self) -> dict[str, Project]:
         """Get all projects as Project objects.
@@ -136,11 +484,31 @@ class ClaudeConfigManager:
         Returns:
             Dictionary mapping project paths to Project objects
         """
+        if not self._dirty and self._projects_cache is not None:
+            return self._projects_cache
+
         projects = {}
         for path, data in self.config_data.get("projects", {}).items():
             projects[path] = Project.from_dict(path, data)
+        self._projects_cache = projects
+        self._dirty = False
         return projects
 
+    def get_project(self, project_path: str) -> Project | None:
+        """Get a single project without building every other one.
+
+        Args:
+            project_path: Path of the project
+
+        Returns:
+            Project object, or None if the project is not in the configuration
+        """
+        if not self._dirty and self._projects_cache is not None:
+            return self._projects_cache.get(project_path)
+
+        data = self.config_data.get("projects", {}).get(project_path)
+        return Project.from_dict(project_path, data) if data is not None else None
+
     def remove_project(self, project_path: str) -> bool:
         """Remove a project from the configuration.
 
@@ -152,6 +520,8 @@ class ClaudeConfigManager:
         """
         if project_path in self.config_data.get("projects", {}):
             del self.config_data["projects"][project_path]
+            self._dirty = True
+            self._project_columns = None
             return True
         return False
 
@@ -168,8 +538,33 @@ class ClaudeConfigManager:
             self.config_data["projects"] = {}
 
         self.config_data["projects"][project.path] = project.to_dict()
+        self._dirty = True
+        self._project_columns = None
         return True
 
+    def update_projects(self, projects: Iterable[Project]) -> int:
+        """Update several projects in the configuration at once.
+
+        The caches are invalidated once for the whole batch; as with
+        update_project, nothing is written until save_config is called.
+
+        Args:
+            projects: Project objects to update
+
+        Returns:
+            Number of projects updated
+        """
+        stored = self.config_data.setdefault("projects", {})
+        count = 0
+        for project in projects:
+            stored[project.path] = project.to_dict()
+            count += 1
+
+        if count:
+            self._dirty = True
+            self._project_columns = None
+        return count
+
     def get_config_size(self) -> int:
         """Get the size of the configuration file in bytes.
 
@@ -183,15 +578,20 @@ class ClaudeConfigManager:
     def get_stats(self) -> dict[str, Any]:
         """Get statistics about the configuration.
 
+        The per-project counts are cached and only refreshed by load_config,
+        update_project(s) and remove_project. A Project from get_projects()
+        that is edited in place is not counted until it is passed to
+        update_project.
+
         Returns:
             Dictionary containing various statistics
         """
-        projects = self.get_projects()
-        total_history = sum(p.history_count for p in projects.values())
-        total_mcp_servers = sum(len(p.mcp_servers) for p in projects.values())
+        paths, history_counts, mcp_counts = self._get_project_columns()
+        total_history = sum(history_counts)
+        total_mcp_servers = sum(mcp_counts)
 
         return {
-            "total_projects": len(projects),
+            "total_projects": len(paths),
             "total_history_entries": total_history,
             "total_mcp_servers": total_mcp_servers,
             "config_size": self.get_config_size(),
@@ -201,6 +601,29 @@ class ClaudeConfigManager:
             "organization": self.config_data.get("oauthAccount", {}).get("organizationName", "N/A"),
         }
 
+    def _get_project_columns(self) -> tuple[list[str], array.array[int], array.array[int]]:
+        """Get per-project counts as parallel columns, rebuilding them if stale.
+
+        Returns:
+            Tuple of (project paths, history counts, MCP server counts)
+        """
+        if self._project_columns is not None:
+            return self._project_columns
+
+        paths: list[str] = []
+        history_counts = array.array("i")
+        mcp_counts = array.array("i")
+        for path, data in self.config_data.get("projects", {}).items():
+            paths.append(path)
+            if isinstance(data, dict):
+                history_counts.append(len(data.get("history") or ()))
+                mcp_counts.append(len(data.get("mcpServers") or ()))
+            else:
+                history_counts.append(0)
+                mcp_counts.append(0)
+        self._project_columns = (paths, history_counts, mcp_counts)
+        return self._project_columns
+
     def restore_from_backup(self, backup_path: Path) -> bool:
         """Restore configuration from a backup file.
 
@@ -218,9 +641,11 @@ class ClaudeConfigManager:
             # Don't create a backup when restoring - it doesn't make sense to
             # backup a corrupted/empty state that we're trying to fix
 
-            # Copy backup to config location
-            # Use str() to ensure Windows compatibility
-            shutil.copy2(str(backup_path), str(self.config_path))
+            # Write the backup to an exclusive, owner-only temp file next to
+            # the config and swap it in, so the config is never written in
+            # place (a backup may be hardlinked to it)
+            temp_path = self._write_temp_file(backup_path.read_bytes())
+            temp_path.replace(self.config_path)
 
             # Verify the copy worked
             if not self.config_path.exists():
@@ -238,9 +663,29 @@ class ClaudeConfigManager:
         """Get list of available backup files.
 
         Returns:
-            List of backup file paths sorted by modification time (most recent first)
+            List of backup file paths sorted by name, i.e. by timestamp (most recent first)
         """
-        return sorted(self.backup_dir.glob("claude_*.json"), reverse=True)
+        return list(reversed(self._get_backup_list()))
+
+    def delete_backup(self, backup_path: Path) -> bool:
+        """Delete a backup file.
+
+        Args:
+            backup_path: Path to the backup file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            backup_path.unlink()
+        except OSError as e:
+            logger.exception(f"Error deleting backup: {e}")
+            return False
+
+        if self._backups is not None and backup_path in self._backups:
+            self._backups.remove(backup_path)
+        logger.info(f"Deleted backup {backup_path}")
+        return True
 
     def get_agents(self, project_path: str | None = None) -> dict[str, Agent]:
         """Get available agents, both global and project-specific.
@@ -251,28 +696,69 @@ class ClaudeConfigManager:
         Returns:
             Dictionary mapping agent names to Agent objects
         """
-        agents = {}
+        agents: dict[str, Agent] = {}
         
         # Global agents
-        global_agents_dir = Path.home() / ".claude" / "agents"
-        if global_agents_dir.exists():
-            for agent_file in global_agents_dir.glob("*.md"):
-                agent = self._parse_agent_file(agent_file, "global")
-                if agent:
-                    agents[agent.name] = agent
+        self._scan_agents_dir(Path.home() / ".claude" / "agents", "global", agents)
         
-        # Project-specific agents
+        # Project-specific agents override global ones with same name
         if project_path:
-            project_agents_dir = Path(project_path) / ".claude" / "agents"
-            if project_agents_dir.exists():
-                for agent_file in project_agents_dir.glob("*.md"):
-                    agent = self._parse_agent_file(agent_file, "project")
-                    if agent:
-                        # Project agents override global ones with same name
-                        agents[agent.name] = agent
+            self._scan_agents_dir(Path(project_path) / ".claude" / "agents", "project", agents)
         
         return agents
-    
+
+    def _scan_agents_dir(self, agents_dir: Path, agent_type: str, agents: dict[str, Agent]) -> None:
+        """Add the agents defined in a directory to ``agents``.
+
+        Uses a single os.scandir pass; DirEntry caches the stat result used
+        for the agent cache lookup. Files that changed since the last scan
+        are parsed on a thread pool when there are enough of them.
+
+        Args:
+            agents_dir: Directory containing agent .md files
+            agent_type: "global" or "project"
+            agents: Mapping of agent names to update in place
+        """
+        try:
+            with os.scandir(agents_dir) as entries:
+                # Same selection as glob("*.md"): no dotfiles, regular files only
+                files = [
+                    (Path(entry.path), entry.stat())
+                    for entry in entries
+                    if not entry.name.startswith(".")
+                    and entry.name.endswith(".md")
+                    and entry.is_file()
+                ]
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.error(f"Error reading agents directory {agents_dir}: {e}")
+            return
+
+        stale = []
+        for path, st in files:
+            cached = self._agent_cache.get((str(path), agent_type))
+            if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+                stale.append((path, st))
+
+        if stale:
+            paths = [path for path, _ in stale]
+            if len(paths) < _PARALLEL_PARSE_MIN_FILES:
+                parsed = [self._parse_agent_file(path, agent_type) for path in paths]
+            else:
+                workers = min(_PARALLEL_PARSE_MAX_WORKERS, len(paths))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    parsed = list(
+                        executor.map(self._parse_agent_file, paths, repeat(agent_type))
+                    )
+            for (path, st), agent in zip(stale, parsed):
+                self._agent_cache[(str(path), agent_type)] = (st.st_mtime_ns, st.st_size, agent)
+
+        for path, _ in files:
+            agent = self._agent_cache[(str(path), agent_type)][2]
+            if agent:
+                agents[agent.name] = agent
+
     def _parse_agent_file(self, file_path: Path, agent_type: str) -> Agent | None:
         """Parse an agent markdown file and extract frontmatter.
         
@@ -284,48 +770,40 @@ class ClaudeConfigManager:
             Agent object if successful, None otherwise
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # Extract frontmatter
-            if content.startswith("---"):
-                # Find the closing ---
-                end_idx = content.find("---", 3)
-                if end_idx != -1:
-                    frontmatter_str = content[3:end_idx].strip()
-                    try:
-                        frontmatter = yaml.safe_load(frontmatter_str)
-                        if frontmatter and isinstance(frontmatter, dict):
-                            # Extract fields from frontmatter
-                            name = frontmatter.get("name", file_path.stem)
-                            description = frontmatter.get("description", "")
-                            tools_str = frontmatter.get("tools", "")
-                            
-                            # Parse tools list
-                            tools = []
-                            if tools_str:
-                                tools = [t.strip() for t in tools_str.split(",") if t.strip()]
-                            
-                            # Create Agent object
-                            agent = Agent(
-                                name=name,
-                                description=description,
-                                tools=tools,
-                                file_path=str(file_path),
-                                color=frontmatter.get("color"),
-                                priority=frontmatter.get("priority"),
-                                neural_patterns=frontmatter.get("neural_patterns", []),
-                                learning_enabled=frontmatter.get("learning_enabled", False),
-                                collective_memory=frontmatter.get("collective_memory", False),
-                                hive_mind_role=frontmatter.get("hive_mind_role"),
-                                concurrent_execution=frontmatter.get("concurrent_execution", False),
-                                sparc_integration=frontmatter.get("sparc_integration", False),
-                                agent_type=agent_type,
-                            )
-                            
-                            return agent
-                    except yaml.YAMLError as e:
-                        logger.warning(f"Error parsing YAML frontmatter in {file_path}: {e}")
+            frontmatter_str = _read_frontmatter(file_path)
+            if frontmatter_str is not None:
+                frontmatter = _parse_flat_frontmatter(frontmatter_str)
+                if frontmatter is None:
+                    frontmatter = _load_yaml_frontmatter(frontmatter_str, file_path)
+                if frontmatter and isinstance(frontmatter, dict):
+                    # Extract fields from frontmatter
+                    name = frontmatter.get("name", file_path.stem)
+                    description = frontmatter.get("description", "")
+                    tools_str = frontmatter.get("tools", "")
+                    
+                    # Parse tools list
+                    tools = []
+                    if tools_str:
+                        tools = [t.strip() for t in tools_str.split(",") if t.strip()]
+                    
+                    # Create Agent object
+                    agent = Agent(
+                        name=name,
+                        description=description,
+                        tools=tools,
+                        file_path=str(file_path),
+                        color=frontmatter.get("color"),
+                        priority=frontmatter.get("priority"),
+                        neural_patterns=frontmatter.get("neural_patterns", []),
+                        learning_enabled=frontmatter.get("learning_enabled", False),
+                        collective_memory=frontmatter.get("collective_memory", False),
+                        hive_mind_role=frontmatter.get("hive_mind_role"),
+                        concurrent_execution=frontmatter.get("concurrent_execution", False),
+                        sparc_integration=frontmatter.get("sparc_integration", False),
+                        agent_type=agent_type,
+                    )
+                    
+                    return agent
             
         except Exception as e:
             logger.error(f"Error reading agent file {file_path}: {e}")
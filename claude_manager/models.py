@@ -7,6 +7,11 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
 
 @dataclass
 class Project:
@@ -46,7 +51,13 @@ class Project:
 
     def get_size_estimate(self) -> int:
         """Estimate the size of project data in bytes."""
-        return len(json.dumps(self.to_dict()))
+        if orjson is not None:
+            return len(orjson.dumps(self.to_dict()))
+        # Same compact UTF-8 encoding as orjson, so the estimate doesn't
+        # depend on whether the optional extra is installed
+        return len(
+            json.dumps(self.to_dict(), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        )
 
     def to_dict(self) -> dict[str, Any]:
         """Convert project to dictionary format for JSON serialization."""
@@ -214,7 +214,7 @@ class SimpleUI:
                 self.config_manager.create_backup()
                 for project in projects_with_history.values():
                     project.history.clear()
-                    self.config_manager.update_project(project)
+                self.config_manager.update_projects(projects_with_history.values())
 
                 if self.config_manager.save_config(create_backup=False):
                     console.print("[green]Cleared all history[/green]")
@@ -237,9 +237,10 @@ class SimpleUI:
                 ).ask():
                     self.config_manager.create_backup()
                     for path in selected:
-                        project = projects_with_history[path]
-                        project.history.clear()
-                        self.config_manager.update_project(project)
+                        projects_with_history[path].history.clear()
+                    self.config_manager.update_projects(
+                        projects_with_history[path] for path in selected
+                    )
 
                     if self.config_manager.save_config(create_backup=False):
                         console.print("[green]Cleared history[/green]")
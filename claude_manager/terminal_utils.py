@@ -4,56 +4,88 @@ from __future__ import annotations
 
 import atexit
 import os
+import shutil
 import signal
+import subprocess
 import sys
+import threading
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Any, Generator
 
-# Comprehensive terminal reset sequences
-TERMINAL_RESET_SEQUENCES = [
-    # Mouse tracking disable - CRITICAL for stopping mouse movement codes
-    "\033[?1000l",    # Disable normal mouse tracking
-    "\033[?1001l",    # Disable mouse highlight tracking
-    "\033[?1002l",    # Disable button event tracking
-    "\033[?1003l",    # Disable any motion tracking - THIS STOPS MOUSE MOVEMENT CODES!
-    "\033[?1004l",    # Disable focus in/out reporting
-    "\033[?1005l",    # Disable UTF-8 mouse mode
-    "\033[?1006l",    # Disable SGR extended reporting
-    "\033[?1015l",    # Disable urxvt extended reporting
-    "\033[?1016l",    # Disable pixel position reporting
-    "\033[?9l",       # Disable X10 mouse reporting
-    "\033[?1000;1002;1003;1004;1005;1006;1015;1016l",  # Bulk disable all mouse modes
-    
-    # Screen and cursor management
-    "\033[?1049l",    # Exit alternate screen buffer
-    "\033[?1047l",    # Use normal screen buffer (fallback)
-    "\033[?47l",      # Use normal screen buffer (old format)
-    "\033[?25h",      # Show cursor
-    "\033[?12l",      # Disable cursor blinking
-    
-    # Query responses disable (fixes [O?2048;0$y)
-    "\033[?2048l",    # Disable specific query mode
-    "\033[?1l",       # Disable application cursor keys
-    "\033[?7h",       # Enable auto-wrap mode
-    "\033[>0c",       # Request primary device attributes (clear pending)
-    
-    # Color and style reset
-    "\033[0m",        # Reset all attributes
-    "\033[39m",       # Default foreground color
-    "\033[49m",       # Default background color
-    "\033[22m",       # Normal intensity
-    "\033[24m",       # No underline
-    "\033[25m",       # No blink
-    "\033[27m",       # No reverse
-    
-    # Clear screen and position
-    "\033[2J",        # Clear entire screen
-    "\033[H",         # Move cursor to top-left
-    "\033[1;1H",      # Move cursor to home position
-    
-    # Final reset
-    "\033c",          # Full terminal reset (RIS - Reset to Initial State)
-]
+# Minimal terminal reset sequences. RIS goes first and restores cursor keys,
+# auto-wrap, colors, attributes and the screen contents; what follows covers
+# the modes some terminals keep across RIS.
+TERMINAL_RESET_SEQUENCES: tuple[bytes, ...] = (
+    b"\033c",          # Full terminal reset (RIS - Reset to Initial State)
+    # Disable every mouse mode - CRITICAL for stopping mouse movement codes
+    b"\033[?9;1000;1001;1002;1003;1004;1005;1006;1015;1016l",
+    b"\033[?1049l",    # Exit alternate screen buffer
+    b"\033[?25h",      # Show cursor
+    b"\033[?2048l",    # Disable in-band resize reports (fixes [O?2048;0$y)
+    b"\033[0m",        # Reset all attributes
+)
+
+# Everything above in one buffer, so a reset is a single write syscall;
+# emergency_terminal_cleanup sends the same bytes
+_RESET_BLOB = b"".join(TERMINAL_RESET_SEQUENCES)
+
+
+@lru_cache(maxsize=None)
+def _stdout_is_tty() -> bool:
+    """Check once whether stdout is a terminal; the answer is cached."""
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _terminal_env() -> dict[str, str]:
+    """Read the environment variables that describe the terminal, once.
+
+    Callers must not mutate the returned dict.
+    """
+    return {name: os.environ.get(name, '') for name in ('TERM', 'COLUMNS', 'LINES')}
+
+
+def reset_tty_cache() -> None:
+    """Forget cached terminal checks, e.g. after replacing sys.stdout or TERM."""
+    _stdout_is_tty.cache_clear()
+    _stdout_fd.cache_clear()
+    _terminal_env.cache_clear()
+    check_terminal_compatibility.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _stdout_fd() -> int | None:
+    """Look up stdout's file descriptor once; None if it has no real one."""
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # Replaced stdout without a real descriptor (e.g. captured output)
+        return None
+
+
+def _write_to_terminal(data: bytes) -> None:
+    """Write raw bytes to stdout with as few syscalls as possible."""
+    # Anything still buffered in sys.stdout must reach the terminal first
+    sys.stdout.flush()
+    fd = _stdout_fd()
+    if fd is None:
+        buffer = getattr(sys.stdout, "buffer", None)
+        if buffer is not None:
+            buffer.write(data)
+        else:
+            sys.stdout.write(data.decode("ascii"))
+        sys.stdout.flush()
+        return
+
+    # os.write retries EINTR itself (PEP 475); only short writes need a loop
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
 
 
 class TerminalManager:
@@ -61,12 +93,14 @@ class TerminalManager:
     
     def __init__(self) -> None:
         self._original_state: dict[str, Any] = {}
-        self._cleanup_registered = False
         self._in_context = False
         
     def __enter__(self) -> TerminalManager:
         """Enter the terminal management context."""
         self._in_context = True
+        # Piped or redirected output: there is no terminal state to protect
+        if not _stdout_is_tty():
+            return self
         self._save_terminal_state()
         self._register_cleanup()
         return self
@@ -80,57 +114,83 @@ class TerminalManager:
         """Save current terminal state for restoration."""
         try:
             # Save environment variables that might affect terminal behavior
-            self._original_state = {
-                'TERM': os.environ.get('TERM', ''),
-                'COLUMNS': os.environ.get('COLUMNS', ''),
-                'LINES': os.environ.get('LINES', ''),
-            }
+            self._original_state = dict(_terminal_env())
         except Exception:
             # If we can't save state, we'll still do our best to reset
             self._original_state = {}
             
     def _register_cleanup(self) -> None:
         """Register cleanup handlers for various exit scenarios."""
-        if self._cleanup_registered:
-            return
-            
-        # Register atexit handler
-        atexit.register(self.force_reset_terminal)
+        _register_cleanup_handlers()
+        
+    def force_reset_terminal(self) -> None:
+        """Force terminal reset using comprehensive escape sequences."""
+        _force_reset_terminal()
+
+
+def _force_reset_terminal() -> bool:
+    """Send the reset sequences to stdout if it is a terminal.
+
+    Returns:
+        True if the sequences were written
+    """
+    if not _stdout_is_tty():
+        return False
         
+    try:
+        # Send all reset sequences in one write
+        _write_to_terminal(_RESET_BLOB)
+        return True
+    except (OSError, IOError):
+        # If we can't write to stdout, terminal is probably closed
+        return False
+
+
+def _exit_cleanup() -> None:
+    """Reset the terminal at exit, escalating only if the normal reset fails."""
+    if not _force_reset_terminal():
+        emergency_terminal_cleanup()
+
+
+def _signal_handler(signum: int, frame: Any) -> None:
+    """Handle signals by performing cleanup and re-raising."""
+    _force_reset_terminal()
+    # Re-raise the signal with default handler
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+class _CleanupState:
+    """Process-wide cleanup bookkeeping."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.handlers_registered = False
+        self.emergency_done = False
+
+
+# Cleanup handlers are process-wide; install them once however many
+# TerminalManager instances are created
+_cleanup_state = _CleanupState()
+
+
+def _register_cleanup_handlers() -> None:
+    """Install the atexit and signal cleanup handlers, once per process."""
+    with _cleanup_state.lock:
+        if _cleanup_state.handlers_registered:
+            return
+
+        atexit.register(_exit_cleanup)
+
         # Register signal handlers for clean exit
         for sig in [signal.SIGINT, signal.SIGTERM]:
             try:
-                signal.signal(sig, self._signal_handler)
+                signal.signal(sig, _signal_handler)
             except (ValueError, OSError):
                 # Some signals might not be available on all platforms
                 pass
-                
-        self._cleanup_registered = True
-        
-    def _signal_handler(self, signum: int, frame: Any) -> None:
-        """Handle signals by performing cleanup and re-raising."""
-        self.force_reset_terminal()
-        # Re-raise the signal with default handler
-        signal.signal(signum, signal.SIG_DFL)
-        os.kill(os.getpid(), signum)
-        
-    def force_reset_terminal(self) -> None:
-        """Force terminal reset using comprehensive escape sequences."""
-        if not sys.stdout.isatty():
-            return
-            
-        try:
-            # Send all reset sequences
-            for sequence in TERMINAL_RESET_SEQUENCES:
-                sys.stdout.write(sequence)
-                sys.stdout.flush()
-                
-            # Extra flush to ensure all sequences are sent
-            sys.stdout.flush()
-            
-        except (OSError, IOError):
-            # If we can't write to stdout, terminal is probably closed
-            pass
+
+        _cleanup_state.handlers_registered = True
 
 
 @contextmanager
@@ -145,19 +205,23 @@ def safe_terminal() -> Generator[TerminalManager, None, None]:
 
 def immediate_terminal_reset() -> None:
     """Immediately reset terminal without context manager."""
-    manager = TerminalManager()
-    manager.force_reset_terminal()
+    _force_reset_terminal()
 
 
+@lru_cache(maxsize=None)
 def check_terminal_compatibility() -> bool:
-    """Check if current terminal supports TUI operations."""
+    """Check if current terminal supports TUI operations.
+
+    The result is cached for the life of the process; reset_tty_cache()
+    clears it.
+    """
     try:
         # Check if we have a TTY
-        if not sys.stdout.isatty():
+        if not _stdout_is_tty():
             return False
             
         # Check TERM environment variable
-        term = os.environ.get('TERM', '').lower()
+        term = _terminal_env()['TERM'].lower()
         if not term or term in ['dumb', 'unknown']:
             return False
             
@@ -173,33 +237,42 @@ def check_terminal_compatibility() -> bool:
         return False
 
 
+@lru_cache(maxsize=None)
+def _reset_command() -> list[str] | None:
+    """Find an external command that resets the terminal, looked up once."""
+    reset = shutil.which("reset")
+    if reset:
+        return [reset]
+    tput = shutil.which("tput")
+    if tput:
+        return [tput, "reset"]
+    return None
+
+
 def emergency_terminal_cleanup() -> None:
-    """Emergency cleanup function that can be called from anywhere."""
+    """Emergency cleanup function that can be called from anywhere.
+
+    Only the first call does anything.
+    """
+    if _cleanup_state.emergency_done:
+        return
+    _cleanup_state.emergency_done = True
+
     try:
-        # This is the nuclear option - reset everything we can think of
-        reset_commands = [
-            "\033[?1000l\033[?1002l\033[?1003l\033[?1004l\033[?1005l\033[?1006l\033[?1015l\033[?1016l",
-            "\033[?1049l\033[?1047l\033[?47l\033[?25h\033[?12l",
-            "\033[?2048l\033[?1l\033[?7h\033[>0c",
-            "\033[0m\033[39m\033[49m\033[22m\033[24m\033[25m\033[27m",
-            "\033[2J\033[H\033[1;1H",
-            "\033c"
-        ]
-        
-        for cmd in reset_commands:
-            try:
-                sys.stdout.write(cmd)
-                sys.stdout.flush()
-            except Exception:
-                continue
-                
+        # Unlike the normal reset, write even when stdout is not a TTY
+        _write_to_terminal(_RESET_BLOB)
     except Exception:
-        # If all else fails, at least try a simple reset
+        # If we can't write the sequences ourselves, let reset(1) try
+        command = _reset_command()
+        if command is None:
+            return
         try:
-            os.system('reset 2>/dev/null || tput reset 2>/dev/null || echo -e "\\033c"')
+            subprocess.run(
+                command,
+                check=False,
+                stdin=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=1,
+            )
         except Exception:
             pass
-
-
-# Auto-register emergency cleanup on module import
-atexit.register(emergency_terminal_cleanup)
\ No newline at end of file
@@ -3,86 +3,130 @@
 from __future__ import annotations
 
 import json
+import pickle
+import shutil
 import tempfile
+import uuid
 from pathlib import Path
 from typing import Any, Generator
 
 import pytest
+from pytest_asyncio import is_async_test
 
 from claude_manager.config import ClaudeConfigManager
 from claude_manager.models import Project
 
 
-@pytest.fixture
-def sample_config_data() -> dict[str, Any]:
-    """Sample configuration data for testing."""
-    return {
-        "numStartups": 10,
-        "firstStartTime": "2024-01-01T00:00:00.000Z",
-        "oauthAccount": {
-            "emailAddress": "test@example.com",
-            "organizationName": "Test Organization",
-        },
-        "projects": {
-            "/home/user/project1": {
-                "allowedTools": ["tool1", "tool2"],
-                "history": [
-                    {"display": "command1", "pastedContents": {}},
-                    {"display": "command2", "pastedContents": {}},
-                ],
-                "mcpServers": {
-                    "server1": {"url": "http://localhost:8080"},
-                },
-                "enabledMcpjsonServers": [],
-                "disabledMcpjsonServers": [],
-                "enableAllProjectMcpServers": False,
-                "hasTrustDialogAccepted": True,
-                "ignorePatterns": ["*.pyc", "__pycache__"],
-                "projectOnboardingSeenCount": 3,
-                "hasClaudeMdExternalIncludesApproved": False,
-                "hasClaudeMdExternalIncludesWarningShown": False,
-                "dontCrawlDirectory": False,
-                "mcpContextUris": [],
-            },
-            "/home/user/project2": {
-                "allowedTools": [],
-                "history": [],
-                "mcpServers": {},
-                "enabledMcpjsonServers": [],
-                "disabledMcpjsonServers": [],
-                "enableAllProjectMcpServers": False,
-                "hasTrustDialogAccepted": False,
-                "ignorePatterns": [],
-                "projectOnboardingSeenCount": 0,
-                "hasClaudeMdExternalIncludesApproved": False,
-                "hasClaudeMdExternalIncludesWarningShown": False,
-                "dontCrawlDirectory": False,
-                "mcpContextUris": [],
-            },
-            "/home/user/nonexistent": {
-                "allowedTools": [],
-                "history": [{"display": "old command", "pastedContents": {}}],
-                "mcpServers": {},
-                "enabledMcpjsonServers": [],
-                "disabledMcpjsonServers": [],
-                "enableAllProjectMcpServers": False,
-                "hasTrustDialogAccepted": False,
-                "ignorePatterns": [],
-                "projectOnboardingSeenCount": 1,
-                "hasClaudeMdExternalIncludesApproved": False,
-                "hasClaudeMdExternalIncludesWarningShown": False,
-                "dontCrawlDirectory": False,
-                "mcpContextUris": [],
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Run every async test on the session event loop, like the async fixtures."""
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
+
+SAMPLE_CONFIG_DATA: dict[str, Any] = {
+    "numStartups": 10,
+    "firstStartTime": "2024-01-01T00:00:00.000Z",
+    "oauthAccount": {
+        "emailAddress": "test@example.com",
+        "organizationName": "Test Organization",
+    },
+    "projects": {
+        "/home/user/project1": {
+            "allowedTools": ["tool1", "tool2"],
+            "history": [
+                {"display": "command1", "pastedContents": {}},
+                {"display": "command2", "pastedContents": {}},
+            ],
+            "mcpServers": {
+                "server1": {"url": "http://localhost:8080"},
             },
+            "enabledMcpjsonServers": [],
+            "disabledMcpjsonServers": [],
+            "enableAllProjectMcpServers": False,
+            "hasTrustDialogAccepted": True,
+            "ignorePatterns": ["*.pyc", "__pycache__"],
+            "projectOnboardingSeenCount": 3,
+            "hasClaudeMdExternalIncludesApproved": False,
+            "hasClaudeMdExternalIncludesWarningShown": False,
+            "dontCrawlDirectory": False,
+            "mcpContextUris": [],
+        },
+        "/home/user/project2": {
+            "allowedTools": [],
+            "history": [],
+            "mcpServers": {},
+            "enabledMcpjsonServers": [],
+            "disabledMcpjsonServers": [],
+            "enableAllProjectMcpServers": False,
+            "hasTrustDialogAccepted": False,
+            "ignorePatterns": [],
+            "projectOnboardingSeenCount": 0,
+            "hasClaudeMdExternalIncludesApproved": False,
+            "hasClaudeMdExternalIncludesWarningShown": False,
+            "dontCrawlDirectory": False,
+            "mcpContextUris": [],
         },
-    }
+        "/home/user/nonexistent": {
+            "allowedTools": [],
+            "history": [{"display": "old command", "pastedContents": {}}],
+            "mcpServers": {},
+            "enabledMcpjsonServers": [],
+            "disabledMcpjsonServers": [],
+            "enableAllProjectMcpServers": False,
+            "hasTrustDialogAccepted": False,
+            "ignorePatterns": [],
+            "projectOnboardingSeenCount": 1,
+            "hasClaudeMdExternalIncludesApproved": False,
+            "hasClaudeMdExternalIncludesWarningShown": False,
+            "dontCrawlDirectory": False,
+            "mcpContextUris": [],
+        },
+    },
+}
+
+
+@pytest.fixture(scope="session")
+def sample_config_pickle() -> bytes:
+    """SAMPLE_CONFIG_DATA pickled once per session."""
+    return pickle.dumps(SAMPLE_CONFIG_DATA, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@pytest.fixture
+def sample_config_data(sample_config_pickle: bytes) -> dict[str, Any]:
+    """Sample configuration data for testing, private to each test."""
+    # Unpickling is several times faster than copy.deepcopy for plain data
+    return pickle.loads(sample_config_pickle)  # noqa: S301
+
+
+@pytest.fixture(scope="session")
+def sample_config_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directory shared by the session's sample config files."""
+    return tmp_path_factory.mktemp("config")
+
+
+@pytest.fixture(scope="session")
+def sample_config_template(sample_config_dir: Path) -> Path:
+    """SAMPLE_CONFIG_DATA serialized once per session, for tests to copy."""
+    template = sample_config_dir / "template.json"
+    template.write_bytes(json.dumps(SAMPLE_CONFIG_DATA, separators=(",", ":")).encode())
+    return template
+
+
+@pytest.fixture
+def sample_config_file(sample_config_dir: Path, sample_config_template: Path) -> Path:
+    """Fresh, uniquely named copy of the sample config for this test."""
+    config_file = sample_config_dir / f"{uuid.uuid4().hex}.json"
+    shutil.copyfile(sample_config_template, config_file)
+    return config_file
 
 
 @pytest.fixture
 def temp_config_file(sample_config_data: dict[str, Any]) -> Generator[Path, None, None]:
     """Create a temporary config file for testing."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        json.dump(sample_config_data, f)
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        f.write(json.dumps(sample_config_data).encode())
         temp_path = Path(f.name)
 
     yield temp_path
@@ -140,8 +184,7 @@ def isolated_config_manager(
 
     # Create config file
     config_path = home / ".claude.json"
-    with open(config_path, "w") as f:
-        json.dump(sample_config_data, f)
+    config_path.write_bytes(json.dumps(sample_config_data).encode())
 
     # Create manager
     manager = ClaudeConfigManager()  # Uses default path
@@ -1,13 +1,16 @@
 """MCP Test Fixtures and Configuration."""
-import json
+from __future__ import annotations
+
+import copy
 import pytest
+import pytest_asyncio
 from pathlib import Path
-from typing import Any, Dict, List
-from unittest.mock import Mock, AsyncMock
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 import asyncio
 from dataclasses import dataclass, field
 
-from claude_manager.models import Project
+if TYPE_CHECKING:
+    from claude_manager.models import Project
 
 
 @dataclass
@@ -20,19 +23,33 @@ class MockMCPServer:
     enabled: bool = True
     running: bool = False
     
+    # Opt-in latency for tests that exercise timing; state tests don't wait
+    startup_delay: float = 0.0
+    shutdown_delay: float = 0.0
+    
     async def start(self):
         """Simulate server start."""
         self.running = True
-        await asyncio.sleep(0.1)  # Simulate startup time
+        if self.startup_delay:
+            await asyncio.sleep(self.startup_delay)
         
     async def stop(self):
         """Simulate server stop."""
         self.running = False
-        await asyncio.sleep(0.05)  # Simulate shutdown time
+        if self.shutdown_delay:
+            await asyncio.sleep(self.shutdown_delay)
         
+    # Last status dict and the (enabled, running) state it was built for
+    _status: Optional[Tuple[Tuple[bool, bool], Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
     def get_status(self) -> Dict[str, Any]:
-        """Get server status."""
-        return {
+        """Get server status; unchanged servers return the same dict."""
+        state = (self.enabled, self.running)
+        if self._status is not None and self._status[0] == state:
+            return self._status[1]
+        status = {
             "name": self.name,
             "enabled": self.enabled,
             "running": self.running,
@@ -40,40 +57,45 @@ class MockMCPServer:
             "args": self.args,
             "env": self.env
         }
+        self._status = (state, status)
+        return status
+
+
+MCP_SERVER_CONFIG: Dict[str, Any] = {
+    "memory": {
+        "command": "memory-mcp",
+        "args": ["--storage", "/tmp/memory"],
+        "env": {"MCP_MODE": "test"}
+    },
+    "filesystem": {
+        "command": "filesystem-mcp",
+        "args": ["--root", "/tmp/fs"],
+        "env": {}
+    },
+    "github": {
+        "command": "github-mcp",
+        "args": ["--token", "test-token"],
+        "env": {"GITHUB_API_URL": "https://api.github.com"}
+    }
+}
 
 
 @pytest.fixture
 def mcp_server_config() -> Dict[str, Any]:
     """Sample MCP server configuration."""
-    return {
-        "memory": {
-            "command": "memory-mcp",
-            "args": ["--storage", "/tmp/memory"],
-            "env": {"MCP_MODE": "test"}
-        },
-        "filesystem": {
-            "command": "filesystem-mcp",
-            "args": ["--root", "/tmp/fs"],
-            "env": {}
-        },
-        "github": {
-            "command": "github-mcp",
-            "args": ["--token", "test-token"],
-            "env": {"GITHUB_API_URL": "https://api.github.com"}
-        }
-    }
+    return copy.deepcopy(MCP_SERVER_CONFIG)
 
 
-@pytest.fixture
-def mock_mcp_servers(mcp_server_config) -> Dict[str, MockMCPServer]:
-    """Create mock MCP servers."""
+@pytest.fixture(scope="module")
+def mock_mcp_servers() -> Dict[str, MockMCPServer]:
+    """Create mock MCP servers, shared by the tests of a module."""
     servers = {}
-    for name, config in mcp_server_config.items():
+    for name, config in MCP_SERVER_CONFIG.items():
         servers[name] = MockMCPServer(
             name=name,
             command=config["command"],
-            args=config.get("args", []),
-            env=config.get("env", {})
+            args=list(config.get("args", [])),
+            env=dict(config.get("env", {}))
         )
     return servers
 
@@ -81,6 +103,8 @@ def mock_mcp_servers(mcp_server_config) -> Dict[str, MockMCPServer]:
 @pytest.fixture
 def sample_project_with_mcp(tmp_path) -> Project:
     """Create a sample project with MCP configuration."""
+    from claude_manager.models import Project
+
     return Project(
         name="test-project-mcp",
         path=str(tmp_path / "test-project-mcp"),
@@ -104,37 +128,41 @@ def sample_project_with_mcp(tmp_path) -> Project:
     )
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="module")
 async def mcp_server_manager(mock_mcp_servers):
-    """Mock MCP server manager."""
+    """Mock MCP server manager, shared by the tests of a module."""
     class MockMCPServerManager:
         def __init__(self):
             self.servers = mock_mcp_servers
-            self.started_servers = []
+            self.started_servers: set[str] = set()
             
         async def start_server(self, name: str):
             """Start a server by name."""
             if name in self.servers and not self.servers[name].running:
                 await self.servers[name].start()
-                self.started_servers.append(name)
+                self.started_servers.add(name)
                 
         async def stop_server(self, name: str):
             """Stop a server by name."""
             if name in self.servers and self.servers[name].running:
                 await self.servers[name].stop()
-                if name in self.started_servers:
-                    self.started_servers.remove(name)
+                self.started_servers.discard(name)
                     
         async def start_all(self):
-            """Start all enabled servers."""
-            for name, server in self.servers.items():
-                if server.enabled:
-                    await self.start_server(name)
+            """Start all enabled servers concurrently."""
+            await asyncio.gather(*(
+                self.start_server(name)
+                for name, server in self.servers.items()
+                if server.enabled
+            ))
                     
         async def stop_all(self):
-            """Stop all running servers."""
-            for name in list(self.started_servers):
-                await self.stop_server(name)
+            """Stop all running servers concurrently."""
+            # Each name is touched by one coroutine and set updates happen
+            # between awaits, so started_servers needs no lock
+            await asyncio.gather(*(
+                self.stop_server(name) for name in list(self.started_servers)
+            ))
                 
         def get_status(self) -> Dict[str, Any]:
             """Get status of all servers."""
@@ -149,6 +177,99 @@ async def mcp_server_manager(mock_mcp_servers):
     await manager.stop_all()
 
 
+@pytest.fixture(autouse=True)
+def _reset_mcp_servers(request):
+    """Return shared mock servers to a stopped state after each test that used them."""
+    yield
+    if "mock_mcp_servers" not in request.fixturenames:
+        return
+    for server in request.getfixturevalue("mock_mcp_servers").values():
+        server.running = False
+        server.enabled = True
+    if "mcp_server_manager" in request.fixturenames:
+        request.getfixturevalue("mcp_server_manager").started_servers.clear()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def running_bus():
+    """Started mock event bus, shared by the tests of a module."""
+    from claude_manager.tests.mcp.mocks import MockMCPEventBus
+
+    bus = MockMCPEventBus()
+    await bus.start()
+    yield bus
+    await bus.stop()
+
+
+@pytest.fixture
+def event_bus(running_bus):
+    """The module's running event bus, emptied for this test."""
+    running_bus.reset()
+    return running_bus
+
+
+@pytest_asyncio.fixture(scope="module")
+async def running_memory_server():
+    """Started mock Memory MCP server, shared by the tests of a module."""
+    from claude_manager.tests.mcp.mocks import MockMemoryMCPServer
+
+    server = MockMemoryMCPServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+def memory_server(running_memory_server):
+    """The module's running Memory MCP server, emptied for this test."""
+    running_memory_server.reset()
+    return running_memory_server
+
+
+@pytest_asyncio.fixture
+async def memory_connection(memory_server):
+    """Connection to the module's Memory MCP server, open for this test."""
+    from claude_manager.tests.mcp.mocks import MockMCPConnection
+
+    connection = MockMCPConnection(memory_server)
+    await connection.connect()
+    yield connection
+    await connection.disconnect()
+
+
+@pytest.fixture(scope="module")
+def _pool_server_cache() -> Dict[str, Any]:
+    """Named memory servers kept for the tests of a module."""
+    return {}
+
+
+@pytest.fixture
+def pool_server(_pool_server_cache):
+    """Factory returning the module's memory server for a name, emptied for this test."""
+    from claude_manager.tests.mcp.mocks import MockMemoryMCPServer
+
+    for server in _pool_server_cache.values():
+        server.reset()
+
+    def _get(name: str):
+        server = _pool_server_cache.get(name)
+        if server is None:
+            server = _pool_server_cache[name] = MockMemoryMCPServer(f"/tmp/{name}")
+        return server
+
+    return _get
+
+
+@pytest_asyncio.fixture
+async def server_pool():
+    """Empty server pool, stopped with its connections after the test."""
+    from claude_manager.tests.mcp.mocks import MockMCPServerPool
+
+    pool = MockMCPServerPool()
+    yield pool
+    await pool.stop_all()
+
+
 @pytest.fixture
 def mcp_test_data_dir() -> Path:
     """Get the MCP test data directory."""
@@ -159,6 +280,8 @@ def mcp_test_data_dir() -> Path:
 def create_test_mcp_config(tmp_path):
     """Factory fixture to create test MCP configurations."""
     def _create_config(name: str, servers: Dict[str, Any]) -> Path:
+        import json
+
         config_path = tmp_path / f"{name}.mcpconfig.json"
         config_data = {
             "name": name,
@@ -169,7 +292,7 @@ def create_test_mcp_config(tmp_path):
                 "description": f"Test MCP config for {name}"
             }
         }
-        config_path.write_text(json.dumps(config_data, indent=2))
+        config_path.write_bytes(json.dumps(config_data, separators=(",", ":")).encode())
         return config_path
     
     return _create_config
@@ -178,6 +301,8 @@ def create_test_mcp_config(tmp_path):
 @pytest.fixture
 def mock_mcp_connection():
     """Mock MCP connection for testing."""
+    from unittest.mock import AsyncMock, Mock
+
     connection = AsyncMock()
     connection.connect = AsyncMock(return_value=True)
     connection.disconnect = AsyncMock()
@@ -205,30 +330,20 @@ def mcp_performance_metrics():
 def mcp_security_validator():
     """Mock security validator for MCP operations."""
     class MockSecurityValidator:
-        def __init__(self):
-            self.allowed_commands = ["memory-mcp", "filesystem-mcp", "github-mcp"]
-            self.forbidden_paths = ["/etc", "/sys", "/root"]
+        ALLOWED_COMMANDS: frozenset[str] = frozenset({"memory-mcp", "filesystem-mcp", "github-mcp"})
+        FORBIDDEN_PATHS: tuple[str, ...] = ("/etc", "/sys", "/root")
+        DANGEROUS_VARS: frozenset[str] = frozenset({"LD_PRELOAD", "LD_LIBRARY_PATH", "PATH"})
             
         def validate_command(self, command: str) -> bool:
             """Validate if command is allowed."""
-            return command in self.allowed_commands
+            return command in self.ALLOWED_COMMANDS
             
         def validate_path(self, path: str) -> bool:
             """Validate if path is safe."""
-            return not any(path.startswith(fp) for fp in self.forbidden_paths)
+            return not path.startswith(self.FORBIDDEN_PATHS)
             
         def validate_env(self, env: Dict[str, str]) -> bool:
             """Validate environment variables."""
-            dangerous_vars = ["LD_PRELOAD", "LD_LIBRARY_PATH", "PATH"]
-            return not any(var in env for var in dangerous_vars)
+            return self.DANGEROUS_VARS.isdisjoint(env)
             
     return MockSecurityValidator()
-
-
-# Async test helpers
-@pytest.fixture
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
\ No newline at end of file
@@ -2,6 +2,7 @@
 import pytest
 import asyncio
 import json
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 from claude_manager.config import ClaudeConfigManager
@@ -16,10 +17,12 @@ from claude_manager.tests.mcp.mocks import (
 )
 
 
+_URI_KEY_TRANS = str.maketrans({"/": ":"})
+
+
 class TestMCPIntegration:
     """Integration tests for MCP functionality."""
     
-    @pytest.mark.asyncio
     async def test_full_mcp_workflow(self, tmp_path):
         """Test complete MCP workflow from config to operation."""
         # Setup config
@@ -43,7 +46,7 @@ class TestMCPIntegration:
                 }
             }
         }
-        config_file.write_text(json.dumps(config_data))
+        config_file.write_bytes(json.dumps(config_data, separators=(",", ":")).encode())
         
         # Initialize components
         config_manager = ClaudeConfigManager(config_file)
@@ -95,7 +98,6 @@ class TestMCPIntegration:
         await server_pool.stop_all()
         await event_bus.stop()
         
-    @pytest.mark.asyncio
     async def test_multiple_mcp_servers(self, sample_project_with_mcp):
         """Test managing multiple MCP servers."""
         project = sample_project_with_mcp
@@ -130,7 +132,6 @@ class TestMCPIntegration:
         
         await server_pool.stop_all()
         
-    @pytest.mark.asyncio
     async def test_mcp_server_enable_disable(self, sample_project_with_mcp):
         """Test enabling and disabling MCP servers."""
         project = sample_project_with_mcp
@@ -163,7 +164,6 @@ class TestMCPIntegration:
         assert "memory" in active_servers
         assert "filesystem" not in active_servers
         
-    @pytest.mark.asyncio
     async def test_mcp_connection_failure_recovery(self):
         """Test MCP connection failure and recovery."""
         server = MockMemoryMCPServer()
@@ -198,7 +198,6 @@ class TestMCPIntegration:
         assert result["success"] is True
         assert result["data"]["value"] == "new-data"
         
-    @pytest.mark.asyncio
     async def test_mcp_context_uri_usage(self, sample_project_with_mcp):
         """Test using MCP context URIs."""
         project = sample_project_with_mcp
@@ -206,25 +205,27 @@ class TestMCPIntegration:
         connection = MockMCPConnection(server)
         await connection.connect()
         
+        # Extract a key from each URI once (simplified)
+        uri_keys = [
+            (uri, uri.replace("://", ":").translate(_URI_KEY_TRANS))
+            for uri in project.mcp_context_uris
+        ]
+        
         # Store data for each context URI
-        for uri in project.mcp_context_uris:
-            # Extract a key from URI (simplified)
-            key = uri.replace("://", ":").replace("/", ":")
+        for uri, key in uri_keys:
             await connection.call("store", {
                 "key": key,
                 "value": {"uri": uri, "data": "context-specific-data"}
             })
             
         # Retrieve and verify
-        for uri in project.mcp_context_uris:
-            key = uri.replace("://", ":").replace("/", ":")
+        for uri, key in uri_keys:
             result = await connection.call("retrieve", {"key": key})
             assert result["success"] is True
             assert result["data"]["value"]["uri"] == uri
             
         await connection.disconnect()
         
-    @pytest.mark.asyncio
     async def test_mcp_performance_monitoring(self):
         """Test monitoring MCP performance."""
         from claude_manager.tests.mcp.mocks import MockMCPMetricsCollector
@@ -234,9 +235,9 @@ class TestMCPIntegration:
         metrics = MockMCPMetricsCollector()
         
         # Monitor connection
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         await connection.connect()
-        connection_time = asyncio.get_event_loop().time() - start_time
+        connection_time = time.perf_counter() - start_time
         metrics.record_connection(connection_time)
         
         # Monitor operations
@@ -246,9 +247,9 @@ class TestMCPIntegration:
         ]
         
         for method, params in operations:
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.perf_counter()
             result = await connection.call(method, params)
-            operation_time = asyncio.get_event_loop().time() - start_time
+            operation_time = time.perf_counter() - start_time
             metrics.record_request(operation_time, success=result.get("success", False))
             
         # Check metrics
@@ -260,7 +261,6 @@ class TestMCPIntegration:
         await connection.disconnect()
         metrics.record_disconnection()
         
-    @pytest.mark.asyncio
     async def test_mcp_config_update_and_reload(self, tmp_path):
         """Test updating MCP config and reloading servers."""
         # Initial config
@@ -321,7 +321,6 @@ class TestMCPIntegration:
         await server_pool.stop_all()
         await new_pool.stop_all()
         
-    @pytest.mark.asyncio
     async def test_mcp_error_handling_chain(self):
         """Test error handling through the MCP chain."""
         event_bus = MockMCPEventBus()
@@ -1,9 +1,17 @@
 """Mock MCP Events and Notifications for Testing."""
 import asyncio
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+import math
+import sys
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import (
+    Any, Awaitable, Callable, DefaultDict, Deque, Dict, Iterable, List, Optional, Tuple,
+    Union
+)
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 
 
 class MCPEventType(Enum):
@@ -20,99 +28,183 @@ class MCPEventType(Enum):
     MEMORY_DELETED = "memory_deleted"
     
 
-@dataclass
+# Events are allocated in bulk; drop the per-instance __dict__ where supported
+DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@lru_cache(maxsize=1024)
+def format_timestamp_ns(timestamp_ns: int) -> str:
+    """Format a time.time_ns() value like datetime.utcnow().isoformat().
+
+    Cached: events emitted together often share one timestamp.
+    """
+    return (_EPOCH + timedelta(microseconds=timestamp_ns // 1000)).isoformat()
+
+
+@dataclass(**DATACLASS_SLOTS)
 class MCPEvent:
-    """MCP Event structure."""
+    """MCP Event structure.
+
+    ``timestamp`` is either a datetime or a time.time_ns() integer; the
+    latter is cheaper to take and is only formatted when serialized.
+    """
     type: MCPEventType
-    timestamp: datetime
+    timestamp: Union[datetime, int]
     server_name: str
     data: Dict[str, Any] = field(default_factory=dict)
     
+    @property
+    def iso(self) -> str:
+        """Timestamp in ISO 8601 format."""
+        if isinstance(self.timestamp, int):
+            return format_timestamp_ns(self.timestamp)
+        # Not cached: aware datetimes for one instant in different UTC
+        # offsets compare equal but format differently
+        return self.timestamp.isoformat()
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary."""
         return {
             "type": self.type.value,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.iso,
             "server_name": self.server_name,
             "data": self.data
         }
 
 
 class MockMCPEventBus:
-    """Mock event bus for MCP events."""
+    """Mock event bus for MCP events.
+
+    Events are delivered to subscribers directly from emit(); start() and
+    stop() only toggle the running flag.
+    """
     
-    def __init__(self):
-        self.events: List[MCPEvent] = []
-        self.subscribers: Dict[MCPEventType, List[Callable]] = {}
+    def __init__(self, max_events: int = 100_000):
+        # Only the most recent max_events are retained
+        self.events: Deque[MCPEvent] = deque(maxlen=max_events)
+        # The retained events again, split by type value and kept in step
+        # with emit(), so per-type lookups and counts don't scan everything
+        self._by_type: DefaultDict[str, Deque[MCPEvent]] = defaultdict(deque)
+        # Handler -> whether it is a coroutine function, in subscription order.
+        # Keyed by the handler itself (not id()) so equal bound methods match.
+        self.subscribers: DefaultDict[MCPEventType, Dict[Callable, bool]] = defaultdict(dict)
         self._running = False
-        self._event_queue: asyncio.Queue = asyncio.Queue()
         
     async def start(self):
         """Start the event bus."""
         self._running = True
-        asyncio.create_task(self._process_events())
         
     async def stop(self):
         """Stop the event bus."""
         self._running = False
-        await self._event_queue.join()
         
     async def emit(self, event: MCPEvent):
-        """Emit an event."""
+        """Emit an event and notify its subscribers.
+
+        Async handlers run concurrently; emit() returns once all are done.
+        """
+        self._record(event)
+        handlers = self.subscribers.get(event.type)
+        if handlers:
+            # Copy so handlers may (un)subscribe while being notified
+            await self._await_handlers(self._call_handlers(event, tuple(handlers.items())))
+            
+    async def emit_many(self, events: Iterable[MCPEvent]):
+        """Emit a batch of events in order.
+
+        Each event type's subscriber list is snapshotted once per batch, so
+        subscription changes made by handlers apply from the next batch.
+        Coroutine handlers for the whole batch are awaited together.
+        """
+        snapshots: Dict[MCPEventType, Tuple[Tuple[Callable, bool], ...]] = {}
+        pending: List[Awaitable] = []
+        for event in events:
+            self._record(event)
+            handlers = snapshots.get(event.type)
+            if handlers is None:
+                handlers = snapshots[event.type] = tuple(
+                    self.subscribers.get(event.type, {}).items()
+                )
+            if handlers:
+                pending.extend(self._call_handlers(event, handlers))
+        await self._await_handlers(pending)
+
+    def _record(self, event: MCPEvent):
+        """Add an event to the history and the per-type index."""
+        if len(self.events) == self.events.maxlen:
+            if not self.events:
+                # max_events=0: events are delivered but never retained
+                return
+            # The evicted event is also the oldest one of its type
+            self._by_type[self.events[0].type.value].popleft()
         self.events.append(event)
-        await self._event_queue.put(event)
+        self._by_type[event.type.value].append(event)
+        
+    @staticmethod
+    def _call_handlers(
+        event: MCPEvent, handlers: Tuple[Tuple[Callable, bool], ...]
+    ) -> List[Awaitable]:
+        """Call each (handler, is_coroutine) pair with the event.
+
+        Plain handlers run immediately, in subscription order; the
+        coroutines of async handlers are returned for the caller to await.
+        """
+        pending = []
+        for handler, is_coro in handlers:
+            try:
+                if is_coro:
+                    pending.append(handler(event))
+                else:
+                    handler(event)
+            except Exception as e:
+                # Log error but continue processing
+                print(f"Error in event handler: {e}")
+        return pending
+        
+    @staticmethod
+    async def _await_handlers(pending: List[Awaitable]):
+        """Run async handler coroutines concurrently and wait for all of them."""
+        if len(pending) == 1:
+            # A lone handler needs no task wrapping
+            try:
+                await pending[0]
+            except Exception as e:
+                print(f"Error in event handler: {e}")
+        elif pending:
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, Exception):
+                    print(f"Error in event handler: {result}")
         
     def subscribe(self, event_type: MCPEventType, handler: Callable):
         """Subscribe to an event type."""
-        if event_type not in self.subscribers:
-            self.subscribers[event_type] = []
-        self.subscribers[event_type].append(handler)
+        self.subscribers[event_type][handler] = asyncio.iscoroutinefunction(handler)
         
     def unsubscribe(self, event_type: MCPEventType, handler: Callable):
         """Unsubscribe from an event type."""
         if event_type in self.subscribers:
-            self.subscribers[event_type].remove(handler)
+            self.subscribers[event_type].pop(handler, None)
             
-    async def _process_events(self):
-        """Process events from the queue."""
-        while self._running:
-            try:
-                event = await asyncio.wait_for(
-                    self._event_queue.get(), 
-                    timeout=0.1
-                )
-                
-                # Notify subscribers
-                handlers = self.subscribers.get(event.type, [])
-                for handler in handlers:
-                    try:
-                        if asyncio.iscoroutinefunction(handler):
-                            await handler(event)
-                        else:
-                            handler(event)
-                    except Exception as e:
-                        # Log error but continue processing
-                        print(f"Error in event handler: {e}")
-                        
-            except asyncio.TimeoutError:
-                continue
-                
     def get_events(self, event_type: Optional[MCPEventType] = None) -> List[MCPEvent]:
         """Get events, optionally filtered by type."""
         if event_type:
-            return [e for e in self.events if e.type == event_type]
-        return self.events.copy()
+            return list(self._by_type.get(event_type.value, ()))
+        return list(self.events)
         
     def clear_events(self):
         """Clear all stored events."""
         self.events.clear()
+        self._by_type.clear()
         
+    def reset(self):
+        """Clear all stored events and subscribers, keeping the running state."""
+        self.clear_events()
+        self.subscribers.clear()
+
     def get_event_counts(self) -> Dict[str, int]:
         """Get count of each event type."""
-        counts = {}
-        for event in self.events:
-            counts[event.type.value] = counts.get(event.type.value, 0) + 1
-        return counts
+        return {event_type: len(events) for event_type, events in self._by_type.items() if events}
 
 
 class MockMCPNotificationService:
@@ -124,76 +216,100 @@ class MockMCPNotificationService:
         
     async def notify_server_start(self, server_name: str, config: Dict[str, Any]):
         """Notify that a server has started."""
+        timestamp = time.time_ns()
         event = MCPEvent(
             type=MCPEventType.SERVER_STARTED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name=server_name,
             data={"config": config}
         )
         await self.event_bus.emit(event)
-        self._store_notification("server_start", server_name, config)
+        self._store_notification("server_start", server_name, timestamp, config)
+        
+    async def notify_server_start_batch(self, servers: Dict[str, Dict[str, Any]]):
+        """Notify that several servers have started, in one emit_many call."""
+        timestamp = time.time_ns()
+        await self.event_bus.emit_many(
+            MCPEvent(
+                type=MCPEventType.SERVER_STARTED,
+                timestamp=timestamp,
+                server_name=server_name,
+                data={"config": config}
+            )
+            for server_name, config in servers.items()
+        )
+        for server_name, config in servers.items():
+            self._store_notification("server_start", server_name, timestamp, config)
         
     async def notify_server_stop(self, server_name: str, reason: str = "normal"):
         """Notify that a server has stopped."""
+        timestamp = time.time_ns()
         event = MCPEvent(
             type=MCPEventType.SERVER_STOPPED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name=server_name,
             data={"reason": reason}
         )
         await self.event_bus.emit(event)
-        self._store_notification("server_stop", server_name, {"reason": reason})
+        self._store_notification("server_stop", server_name, timestamp, {"reason": reason})
         
     async def notify_server_error(self, server_name: str, error: str):
         """Notify that a server encountered an error."""
+        timestamp = time.time_ns()
         event = MCPEvent(
             type=MCPEventType.SERVER_ERROR,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name=server_name,
             data={"error": error}
         )
         await self.event_bus.emit(event)
-        self._store_notification("server_error", server_name, {"error": error})
+        self._store_notification("server_error", server_name, timestamp, {"error": error})
         
     async def notify_connection_established(self, server_name: str, connection_id: str):
         """Notify that a connection was established."""
+        timestamp = time.time_ns()
         event = MCPEvent(
             type=MCPEventType.CONNECTION_ESTABLISHED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name=server_name,
             data={"connection_id": connection_id}
         )
         await self.event_bus.emit(event)
-        self._store_notification("connection_established", server_name, {"connection_id": connection_id})
+        self._store_notification("connection_established", server_name, timestamp, {"connection_id": connection_id})
         
     async def notify_connection_lost(self, server_name: str, connection_id: str, reason: str):
         """Notify that a connection was lost."""
+        timestamp = time.time_ns()
         event = MCPEvent(
             type=MCPEventType.CONNECTION_LOST,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name=server_name,
             data={"connection_id": connection_id, "reason": reason}
         )
         await self.event_bus.emit(event)
-        self._store_notification("connection_lost", server_name, {
+        self._store_notification("connection_lost", server_name, timestamp, {
             "connection_id": connection_id, 
             "reason": reason
         })
         
-    def _store_notification(self, type: str, server_name: str, data: Dict[str, Any]):
-        """Store a notification."""
+    def _store_notification(self, type: str, server_name: str, timestamp: int,
+                            data: Dict[str, Any]):
+        """Store a notification stamped with its event's ``time_ns`` timestamp."""
         self.notifications.append({
             "type": type,
             "server_name": server_name,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "data": data
         })
         
     def get_notifications(self, type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get notifications, optionally filtered by type."""
-        if type:
-            return [n for n in self.notifications if n["type"] == type]
-        return self.notifications.copy()
+        # Timestamps are stored raw and formatted only when read
+        return [
+            {**n, "timestamp": format_timestamp_ns(n["timestamp"])}
+            for n in self.notifications
+            if not type or n["type"] == type
+        ]
         
     def clear_notifications(self):
         """Clear all notifications."""
@@ -201,15 +317,26 @@ class MockMCPNotificationService:
 
 
 class MockMCPMetricsCollector:
-    """Mock metrics collector for MCP operations."""
+    """Mock metrics collector for MCP operations.
+
+    Timings are kept as running aggregates (count/min/max/sum) rather than
+    raw samples, so memory and summaries don't grow with history. The
+    summary is computed once per change (record_*() or reset()); change
+    metrics through those rather than editing ``metrics``/``counters``
+    directly.
+    """
+    
+    TIMINGS = (
+        "server_start_time",
+        "server_stop_time",
+        "request_processing_time",
+        "connection_establishment_time",
+        "memory_operation_time",
+    )
     
     def __init__(self):
-        self.metrics: Dict[str, List[float]] = {
-            "server_start_time": [],
-            "server_stop_time": [],
-            "request_processing_time": [],
-            "connection_establishment_time": [],
-            "memory_operation_time": []
+        self.metrics: Dict[str, Dict[str, float]] = {
+            name: self._empty_timing() for name in self.TIMINGS
         }
         self.counters: Dict[str, int] = {
             "total_requests": 0,
@@ -218,18 +345,36 @@ class MockMCPMetricsCollector:
             "total_connections": 0,
             "active_connections": 0
         }
+        # Bumped on every change; the summary is rebuilt when it moves on
+        self._version = 0
+        self._summary: Optional[Tuple[int, Dict[str, Any]]] = None
+        
+    @staticmethod
+    def _empty_timing() -> Dict[str, float]:
+        return {"count": 0, "min": math.inf, "max": -math.inf, "sum": 0.0}
+        
+    def _record_timing(self, metric_name: str, duration: float):
+        """Fold one sample into a timing aggregate."""
+        self._version += 1
+        timing = self.metrics[metric_name]
+        timing["count"] += 1
+        timing["sum"] += duration
+        if duration < timing["min"]:
+            timing["min"] = duration
+        if duration > timing["max"]:
+            timing["max"] = duration
         
     def record_server_start(self, duration: float):
         """Record server start time."""
-        self.metrics["server_start_time"].append(duration)
+        self._record_timing("server_start_time", duration)
         
     def record_server_stop(self, duration: float):
         """Record server stop time."""
-        self.metrics["server_stop_time"].append(duration)
+        self._record_timing("server_stop_time", duration)
         
     def record_request(self, duration: float, success: bool = True):
         """Record request processing time."""
-        self.metrics["request_processing_time"].append(duration)
+        self._record_timing("request_processing_time", duration)
         self.counters["total_requests"] += 1
         if success:
             self.counters["successful_requests"] += 1
@@ -238,46 +383,62 @@ class MockMCPMetricsCollector:
             
     def record_connection(self, duration: float):
         """Record connection establishment time."""
-        self.metrics["connection_establishment_time"].append(duration)
+        self._record_timing("connection_establishment_time", duration)
         self.counters["total_connections"] += 1
         self.counters["active_connections"] += 1
         
     def record_disconnection(self):
         """Record a disconnection."""
+        self._version += 1
         self.counters["active_connections"] = max(0, self.counters["active_connections"] - 1)
         
     def record_memory_operation(self, operation: str, duration: float):
         """Record memory operation time."""
-        self.metrics["memory_operation_time"].append(duration)
+        self._record_timing("memory_operation_time", duration)
         
     def get_metrics_summary(self) -> Dict[str, Any]:
-        """Get summary of all metrics."""
-        summary = {
-            "counters": self.counters.copy(),
-            "timings": {}
+        """Get summary of all metrics.
+
+        Each call returns fresh dicts, copied from a summary that is only
+        recomputed when the metrics change.
+        """
+        if self._summary is None or self._summary[0] != self._version:
+            self._summary = (self._version, self._build_summary())
+        summary = self._summary[1]
+        return {
+            "counters": dict(summary["counters"]),
+            "timings": {name: dict(timing) for name, timing in summary["timings"].items()}
         }
         
-        for metric_name, values in self.metrics.items():
-            if values:
-                summary["timings"][metric_name] = {
-                    "count": len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "avg": sum(values) / len(values)
+    def _build_summary(self) -> Dict[str, Any]:
+        """Compute the summary from the current metrics."""
+        timings = {}
+        for metric_name, timing in self.metrics.items():
+            count = timing["count"]
+            if count:
+                timings[metric_name] = {
+                    "count": count,
+                    "min": timing["min"],
+                    "max": timing["max"],
+                    "avg": timing["sum"] / count
                 }
             else:
-                summary["timings"][metric_name] = {
+                timings[metric_name] = {
                     "count": 0,
                     "min": 0,
                     "max": 0,
                     "avg": 0
                 }
                 
-        return summary
+        return {
+            "counters": self.counters.copy(),
+            "timings": timings
+        }
         
     def reset(self):
         """Reset all metrics."""
+        self._version += 1
         for key in self.metrics:
-            self.metrics[key].clear()
+            self.metrics[key] = self._empty_timing()
         for key in self.counters:
-            self.counters[key] = 0
\ No newline at end of file
+            self.counters[key] = 0
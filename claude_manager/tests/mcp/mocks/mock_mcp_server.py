@@ -2,23 +2,27 @@
 import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
 from dataclasses import dataclass, field
 import uuid
+from bisect import bisect_left
+from collections import deque
+
+from .mock_mcp_events import DATACLASS_SLOTS, format_timestamp_ns
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class MCPRequest:
-    """MCP Request structure."""
+    """MCP Request structure; immutable so one request can be sent repeatedly."""
     id: str
     method: str
     params: Dict[str, Any] = field(default_factory=dict)
     
     
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MCPResponse:
     """MCP Response structure."""
     id: str
@@ -29,60 +33,90 @@ class MCPResponse:
 class MockMemoryMCPServer:
     """Mock implementation of a Memory MCP server."""
     
-    def __init__(self, storage_path: str = "/tmp/memory"):
+    # JSON-RPC error codes; each rejected request gets its own copy of
+    # the not-running error
+    _METHOD_NOT_FOUND = -32601
+    _INTERNAL_ERROR = -32603
+    _NOT_RUNNING_ERROR: Dict[str, Any] = {"code": _INTERNAL_ERROR, "message": "Server not running"}
+    
+    def __init__(
+        self,
+        storage_path: str = "/tmp/memory",
+        log_traffic: bool = False,
+        log_capacity: int = 1000,
+        startup_delay: float = 0.0,
+        shutdown_delay: float = 0.0,
+    ):
         self.storage_path = storage_path
+        # Opt-in simulated latency for start()/stop()
+        self.startup_delay = startup_delay
+        self.shutdown_delay = shutdown_delay
         self.memory_store: Dict[str, Any] = {}
+        # Sorted copy of the store's keys for prefix listing; None when stale
+        self._sorted_keys: Optional[List[str]] = None
         self.running = False
-        self.request_handlers: Dict[str, Callable] = {
-            "store": self._handle_store,
-            "retrieve": self._handle_retrieve,
-            "list": self._handle_list,
-            "delete": self._handle_delete,
-            "clear": self._handle_clear,
-            "stats": self._handle_stats
-        }
-        self._request_log: List[MCPRequest] = []
-        self._response_log: List[MCPResponse] = []
+        self._request_count = 0
+        self._response_count = 0
+        # Traffic is only retained (most recent log_capacity) when asked for
+        self._request_log: Optional[Deque[MCPRequest]] = (
+            deque(maxlen=log_capacity) if log_traffic else None
+        )
+        self._response_log: Optional[Deque[MCPResponse]] = (
+            deque(maxlen=log_capacity) if log_traffic else None
+        )
         
     async def start(self):
         """Start the mock server."""
         logger.info(f"Starting MockMemoryMCPServer with storage at {self.storage_path}")
         self.running = True
-        await asyncio.sleep(0.1)  # Simulate startup time
+        if self.startup_delay:
+            await asyncio.sleep(self.startup_delay)
         
     async def stop(self):
         """Stop the mock server."""
         logger.info("Stopping MockMemoryMCPServer")
         self.running = False
-        await asyncio.sleep(0.05)  # Simulate shutdown time
+        if self.shutdown_delay:
+            await asyncio.sleep(self.shutdown_delay)
         
+    def reset(self):
+        """Clear stored keys, counters and logs, keeping the running state."""
+        self.memory_store.clear()
+        self._sorted_keys = None
+        self._request_count = 0
+        self._response_count = 0
+        if self._request_log is not None:
+            self._request_log.clear()
+            self._response_log.clear()
+
     async def handle_request(self, request: MCPRequest) -> MCPResponse:
         """Handle incoming MCP request."""
         if not self.running:
-            return MCPResponse(
-                id=request.id,
-                error={"code": -32603, "message": "Server not running"}
-            )
+            return MCPResponse(id=request.id, error=dict(self._NOT_RUNNING_ERROR))
             
-        self._request_log.append(request)
+        self._request_count += 1
+        if self._request_log is not None:
+            self._request_log.append(request)
         
-        handler = self.request_handlers.get(request.method)
+        handler = self._HANDLERS.get(request.method)
         if not handler:
             response = MCPResponse(
                 id=request.id,
-                error={"code": -32601, "message": f"Method not found: {request.method}"}
+                error={"code": self._METHOD_NOT_FOUND, "message": f"Method not found: {request.method}"}
             )
         else:
             try:
-                result = await handler(request.params)
+                result = await handler(self, request.params)
                 response = MCPResponse(id=request.id, result=result)
             except Exception as e:
                 response = MCPResponse(
                     id=request.id,
-                    error={"code": -32603, "message": str(e)}
+                    error={"code": self._INTERNAL_ERROR, "message": str(e)}
                 )
                 
-        self._response_log.append(response)
+        self._response_count += 1
+        if self._response_log is not None:
+            self._response_log.append(response)
         return response
         
     async def _handle_store(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -93,9 +127,11 @@ class MockMemoryMCPServer:
         if not key:
             raise ValueError("Key is required")
             
+        if key not in self.memory_store:
+            self._sorted_keys = None
         self.memory_store[key] = {
             "value": value,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
             "metadata": params.get("metadata", {})
         }
         
@@ -111,17 +147,30 @@ class MockMemoryMCPServer:
         if key not in self.memory_store:
             return {"success": False, "error": "Key not found"}
             
+        # Timestamps are stored raw and formatted only when read
+        entry = self.memory_store[key]
         return {
             "success": True,
             "key": key,
-            "data": self.memory_store[key]
+            "data": {**entry, "timestamp": format_timestamp_ns(entry["timestamp"])}
         }
         
     async def _handle_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """List all keys in memory."""
         prefix = params.get("prefix", "")
         
-        keys = [k for k in self.memory_store.keys() if k.startswith(prefix)]
+        if not prefix:
+            keys = list(self.memory_store)
+        else:
+            # Keys sharing a prefix are contiguous in sorted order
+            if self._sorted_keys is None:
+                self._sorted_keys = sorted(self.memory_store)
+            sorted_keys = self._sorted_keys
+            keys = []
+            for i in range(bisect_left(sorted_keys, prefix), len(sorted_keys)):
+                if not sorted_keys[i].startswith(prefix):
+                    break
+                keys.append(sorted_keys[i])
         
         return {
             "success": True,
@@ -138,6 +187,7 @@ class MockMemoryMCPServer:
             
         if key in self.memory_store:
             del self.memory_store[key]
+            self._sorted_keys = None
             return {"success": True, "key": key}
         else:
             return {"success": False, "error": "Key not found"}
@@ -151,6 +201,7 @@ class MockMemoryMCPServer:
             
         count = len(self.memory_store)
         self.memory_store.clear()
+        self._sorted_keys = None
         
         return {"success": True, "cleared": count}
         
@@ -162,13 +213,13 @@ class MockMemoryMCPServer:
                 "total_keys": len(self.memory_store),
                 "storage_path": self.storage_path,
                 "running": self.running,
-                "request_count": len(self._request_log),
-                "response_count": len(self._response_log)
+                "request_count": self._request_count,
+                "response_count": self._response_count
             }
         }
         
     def get_logs(self) -> Dict[str, List]:
-        """Get request and response logs."""
+        """Get request and response logs (empty unless log_traffic is set)."""
         return {
             "requests": [
                 {
@@ -176,7 +227,7 @@ class MockMemoryMCPServer:
                     "method": req.method,
                     "params": req.params
                 }
-                for req in self._request_log
+                for req in self._request_log or ()
             ],
             "responses": [
                 {
@@ -184,9 +235,24 @@ class MockMemoryMCPServer:
                     "result": resp.result,
                     "error": resp.error
                 }
-                for resp in self._response_log
+                for resp in self._response_log or ()
             ]
         }
+        
+    # Method name -> handler function, built once for the class
+    _HANDLERS: Dict[str, Callable] = {
+        "store": _handle_store,
+        "retrieve": _handle_retrieve,
+        "list": _handle_list,
+        "delete": _handle_delete,
+        "clear": _handle_clear,
+        "stats": _handle_stats
+    }
+    
+    @property
+    def request_handlers(self) -> Dict[str, Callable]:
+        """Supported methods mapped to their bound handlers."""
+        return {name: handler.__get__(self) for name, handler in self._HANDLERS.items()}
 
 
 class MockMCPConnection:
@@ -196,6 +262,8 @@ class MockMCPConnection:
         self.server = server or MockMemoryMCPServer()
         self.connected = False
         self._request_id_counter = 0
+        # Requests sent but not yet answered, by request id
+        self._pending: Dict[str, MCPRequest] = {}
         
     async def connect(self) -> bool:
         """Connect to the mock server."""
@@ -216,9 +284,8 @@ class MockMCPConnection:
         self._request_id_counter += 1
         request_id = f"req_{self._request_id_counter}"
         
-        request = MCPRequest(id=request_id, method=method, params=params)
         # Store request for async processing
-        self._pending_request = request
+        self._pending[request_id] = MCPRequest(id=request_id, method=method, params=params)
         
         return request_id
         
@@ -228,15 +295,13 @@ class MockMCPConnection:
             raise RuntimeError("Not connected")
             
         # Process the pending request
-        if hasattr(self, '_pending_request') and self._pending_request.id == request_id:
-            response = await self.server.handle_request(self._pending_request)
-            delattr(self, '_pending_request')
-            return response
-        else:
+        request = self._pending.pop(request_id, None)
+        if request is None:
             return MCPResponse(
                 id=request_id,
                 error={"code": -32600, "message": "Invalid request"}
             )
+        return await self.server.handle_request(request)
             
     async def call(self, method: str, params: Dict[str, Any] = None) -> Any:
         """Convenience method to send request and get response."""
@@ -1,17 +1,62 @@
 #!/usr/bin/env python3
 """Quick test runner for MCP tests."""
 import sys
-import subprocess
 from pathlib import Path
+from typing import Dict, Optional
+
+
+class _ResultPrinter:
+    """pytest plugin that prints each test result as soon as it is reported."""
+
+    def __init__(self, categories: Dict[str, str]):
+        self.categories = categories  # test file -> category name
+        self.passed = 0
+        self.failed = 0
+        self._current_file: Optional[str] = None
+
+    def _file_for(self, nodeid: str) -> Optional[str]:
+        node_path = nodeid.split("::", 1)[0]
+        for test_file in self.categories:
+            if node_path.endswith(test_file):
+                return test_file
+        return None
+
+    def _report(self, nodeid: str, icon: str, outcome: str):
+        test_file = self._file_for(nodeid)
+        if test_file is not None and test_file != self._current_file:
+            self._current_file = test_file
+            print(f"\n📁 {self.categories[test_file]}")
+            print("-" * 40)
+        print(f"{icon} {nodeid} {outcome}", flush=True)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and report.passed:
+            self._report(report.nodeid, "✅", "PASSED")
+            self.passed += 1
+        elif report.failed:
+            if report.when == "call":
+                self._report(report.nodeid, "❌", "FAILED")
+            else:
+                self._report(report.nodeid, "💥", "ERROR")
+            self.failed += 1
+
+    def pytest_collectreport(self, report):
+        if report.failed:
+            self._report(report.nodeid, "💥", "ERROR")
+            print(f"\n⚠️  Errors in {report.nodeid}:")
+            print(str(report.longrepr)[:500])  # First 500 chars of error
+            self.failed += 1
 
 
 def run_mcp_tests():
     """Run all MCP tests and display results."""
+    import pytest
+
     test_dir = Path(__file__).parent
-    
+
     print("🧪 Running MCP Test Suite\n")
     print("=" * 60)
-    
+
     # Test categories
     test_categories = [
         ("Unit Tests - Models", "unit/test_mcp_models.py"),
@@ -21,58 +66,43 @@ def run_mcp_tests():
         ("Integration Tests", "integration/test_mcp_integration.py"),
         ("Workflow Tests", "workflows/test_mcp_workflows.py")
     ]
-    
-    total_passed = 0
-    total_failed = 0
-    
+
+    existing: Dict[str, str] = {}
     for category, test_file in test_categories:
-        print(f"\n📁 {category}")
-        print("-" * 40)
-        
-        test_path = test_dir / test_file
-        if not test_path.exists():
+        if (test_dir / test_file).exists():
+            existing[test_file] = category
+        else:
+            print(f"\n📁 {category}")
+            print("-" * 40)
             print(f"❌ Test file not found: {test_file}")
-            continue
-            
-        # Run pytest for this file
-        cmd = [
-            sys.executable, "-m", "pytest",
-            str(test_path),
-            "-v",
-            "--tb=short",
-            "--no-header"
-        ]
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=test_dir.parent.parent.parent  # Project root
-            )
-            
-            # Parse output for summary
-            output_lines = result.stdout.split('\n')
-            for line in output_lines:
-                if " PASSED" in line:
-                    print(f"✅ {line.strip()}")
-                    total_passed += 1
-                elif " FAILED" in line:
-                    print(f"❌ {line.strip()}")
-                    total_failed += 1
-                elif " ERROR" in line:
-                    print(f"💥 {line.strip()}")
-                    total_failed += 1
-                    
-            # Show failures if any
-            if result.returncode != 0 and result.stderr:
-                print(f"\n⚠️  Errors in {test_file}:")
-                print(result.stderr[:500])  # First 500 chars of error
-                
-        except Exception as e:
-            print(f"💥 Error running tests: {e}")
-            total_failed += 1
-            
+
+    # One in-process pytest session for every file, with pytest's own
+    # terminal output (and the ini addopts that need it) off; results
+    # stream out through the plugin as each test finishes
+    printer = _ResultPrinter(existing)
+    try:
+        exit_code = pytest.main(
+            [str(test_dir / f) for f in existing]
+            + [
+                "-o", "addopts=",
+                "-p", "no:terminal",
+                "--rootdir", str(test_dir.parent.parent.parent),
+            ],
+            plugins=[printer],
+        )
+    except Exception as e:
+        print(f"💥 Error running tests: {e}")
+        exit_code = None
+        printer.failed += 1
+
+    total_passed = printer.passed
+    total_failed = printer.failed
+
+    # Usage or internal errors produce no per-test reports
+    if exit_code not in (None, 0, 1) and not total_failed:
+        print(f"\n⚠️  pytest exited with status {int(exit_code)}")
+        total_failed += 1
+
     # Summary
     print("\n" + "=" * 60)
     print("📊 Test Summary")
@@ -80,15 +110,15 @@ def run_mcp_tests():
     print(f"✅ Passed: {total_passed}")
     print(f"❌ Failed: {total_failed}")
     print(f"📈 Total:  {total_passed + total_failed}")
-    
+
     if total_failed == 0:
         print("\n🎉 All tests passed!")
     else:
         print(f"\n⚠️  {total_failed} tests failed!")
-        
+
     return total_failed == 0
 
 
 if __name__ == "__main__":
     success = run_mcp_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(0 if success else 1)
@@ -1,7 +1,9 @@
 """Unit tests for MCP events and notifications."""
 import pytest
 import asyncio
-from datetime import datetime
+import json
+import time
+from datetime import datetime, timedelta, timezone
 from claude_manager.tests.mcp.mocks import (
     MCPEventType,
     MCPEvent,
@@ -42,12 +44,29 @@ class TestMCPEvent:
         assert event_dict["timestamp"] == timestamp.isoformat()
         assert event_dict["server_name"] == "test"
         assert event_dict["data"]["connection_id"] == "conn123"
+        
+    def test_event_to_dict_ns_timestamp(self):
+        """Test that time_ns timestamps serialize like their datetime."""
+        timestamp = datetime(2024, 1, 2, 3, 4, 5, 678901)
+        timestamp_ns = int((timestamp - datetime(1970, 1, 1)).total_seconds()) * 10**9 + 678901000
+        
+        events = [MCPEvent(MCPEventType.SERVER_STARTED, timestamp_ns, f"s{i}") for i in range(2)]
+        
+        assert [e.to_dict()["timestamp"] for e in events] == [timestamp.isoformat()] * 2
+        
+    def test_event_to_dict_keeps_utc_offset(self):
+        """Test that equal aware timestamps keep their own UTC offsets."""
+        utc = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        local = utc.astimezone(timezone(timedelta(hours=2)))
+        
+        events = [MCPEvent(MCPEventType.SERVER_STARTED, ts, "s") for ts in (utc, local)]
+        
+        assert [e.iso for e in events] == [utc.isoformat(), local.isoformat()]
 
 
 class TestMockMCPEventBus:
     """Test the mock MCP event bus."""
     
-    @pytest.mark.asyncio
     async def test_event_bus_lifecycle(self):
         """Test starting and stopping event bus."""
         bus = MockMCPEventBus()
@@ -57,44 +76,33 @@ class TestMockMCPEventBus:
         await bus.stop()
         assert not bus._running
         
-    @pytest.mark.asyncio
-    async def test_emit_and_store_events(self):
+    async def test_emit_and_store_events(self, event_bus):
         """Test emitting and storing events."""
-        bus = MockMCPEventBus()
-        await bus.start()
-        
+        timestamp = time.time_ns()
         # Emit events
         event1 = MCPEvent(
             type=MCPEventType.SERVER_STARTED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name="server1"
         )
         event2 = MCPEvent(
             type=MCPEventType.SERVER_STOPPED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name="server1"
         )
         
-        await bus.emit(event1)
-        await bus.emit(event2)
-        
-        # Give time for processing
-        await asyncio.sleep(0.2)
+        await event_bus.emit(event1)
+        await event_bus.emit(event2)
         
         # Check stored events
-        events = bus.get_events()
+        events = event_bus.get_events()
         assert len(events) == 2
         assert events[0].type == MCPEventType.SERVER_STARTED
         assert events[1].type == MCPEventType.SERVER_STOPPED
         
-        await bus.stop()
-        
-    @pytest.mark.asyncio
-    async def test_event_subscription(self):
+    async def test_event_subscription(self, event_bus):
         """Test subscribing to events."""
-        bus = MockMCPEventBus()
-        await bus.start()
-        
+        timestamp = time.time_ns()
         # Track received events
         received_events = []
         
@@ -102,124 +110,193 @@ class TestMockMCPEventBus:
             received_events.append(event)
             
         # Subscribe to server started events
-        bus.subscribe(MCPEventType.SERVER_STARTED, handler)
+        event_bus.subscribe(MCPEventType.SERVER_STARTED, handler)
         
         # Emit various events
-        await bus.emit(MCPEvent(
+        await event_bus.emit(MCPEvent(
             type=MCPEventType.SERVER_STARTED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name="test1"
         ))
-        await bus.emit(MCPEvent(
+        await event_bus.emit(MCPEvent(
             type=MCPEventType.SERVER_STOPPED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name="test1"
         ))
-        await bus.emit(MCPEvent(
+        await event_bus.emit(MCPEvent(
             type=MCPEventType.SERVER_STARTED,
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             server_name="test2"
         ))
         
-        # Give time for processing
-        await asyncio.sleep(0.2)
-        
         # Should have received only SERVER_STARTED events
         assert len(received_events) == 2
         assert all(e.type == MCPEventType.SERVER_STARTED for e in received_events)
         
-        await bus.stop()
-        
-    @pytest.mark.asyncio
-    async def test_async_event_handler(self):
+    async def test_async_event_handler(self, event_bus):
         """Test async event handlers."""
-        bus = MockMCPEventBus()
-        await bus.start()
-        
         processed = []
         
         async def async_handler(event):
             await asyncio.sleep(0.1)  # Simulate async work
             processed.append(event.server_name)
             
-        bus.subscribe(MCPEventType.CONNECTION_ESTABLISHED, async_handler)
+        event_bus.subscribe(MCPEventType.CONNECTION_ESTABLISHED, async_handler)
         
-        await bus.emit(MCPEvent(
+        await event_bus.emit(MCPEvent(
             type=MCPEventType.CONNECTION_ESTABLISHED,
             timestamp=datetime.utcnow(),
             server_name="async-test"
         ))
         
-        # Wait for async processing
-        await asyncio.sleep(0.3)
-        
         assert "async-test" in processed
         
-        await bus.stop()
+    async def test_mixed_handlers_and_unsubscribe(self, event_bus):
+        """Test sync and async handlers together, then unsubscribing one."""
+        timestamp = time.time_ns()
+        received = []
         
-    @pytest.mark.asyncio
-    async def test_event_filtering(self):
-        """Test filtering events by type."""
-        bus = MockMCPEventBus()
-        await bus.start()
+        def sync_handler(event):
+            received.append(("sync", event.server_name))
+            
+        async def async_handler(event):
+            received.append(("async", event.server_name))
+            
+        event_bus.subscribe(MCPEventType.SERVER_ERROR, sync_handler)
+        event_bus.subscribe(MCPEventType.SERVER_ERROR, async_handler)
+        
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_ERROR, timestamp, "s1"))
+        event_bus.unsubscribe(MCPEventType.SERVER_ERROR, sync_handler)
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_ERROR, timestamp, "s2"))
+        
+        assert received == [("sync", "s1"), ("async", "s1"), ("async", "s2")]
+        # Unsubscribing twice is harmless
+        event_bus.unsubscribe(MCPEventType.SERVER_ERROR, sync_handler)
         
+    async def test_async_handlers_run_concurrently(self, event_bus):
+        """Test that async handlers of one event don't wait for each other."""
+        first_started = asyncio.Event()
+        second_started = asyncio.Event()
+        
+        async def first(event):
+            first_started.set()
+            await second_started.wait()
+            
+        async def second(event):
+            second_started.set()
+            await first_started.wait()
+            
+        event_bus.subscribe(MCPEventType.SERVER_STARTED, first)
+        event_bus.subscribe(MCPEventType.SERVER_STARTED, second)
+        
+        # Run one after the other, the first handler would wait forever
+        await asyncio.wait_for(
+            event_bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, time.time_ns(), "s1")),
+            timeout=1
+        )
+        
+    async def test_event_filtering(self, event_bus):
+        """Test filtering events by type."""
+        timestamp = time.time_ns()
         # Emit various events
         for i in range(3):
-            await bus.emit(MCPEvent(
+            await event_bus.emit(MCPEvent(
                 type=MCPEventType.REQUEST_RECEIVED,
-                timestamp=datetime.utcnow(),
+                timestamp=timestamp,
                 server_name=f"server{i}"
             ))
         for i in range(2):
-            await bus.emit(MCPEvent(
+            await event_bus.emit(MCPEvent(
                 type=MCPEventType.RESPONSE_SENT,
-                timestamp=datetime.utcnow(),
+                timestamp=timestamp,
                 server_name=f"server{i}"
             ))
             
-        await asyncio.sleep(0.1)
-        
         # Filter by type
-        request_events = bus.get_events(MCPEventType.REQUEST_RECEIVED)
-        response_events = bus.get_events(MCPEventType.RESPONSE_SENT)
+        request_events = event_bus.get_events(MCPEventType.REQUEST_RECEIVED)
+        response_events = event_bus.get_events(MCPEventType.RESPONSE_SENT)
         
         assert len(request_events) == 3
         assert len(response_events) == 2
         
-        await bus.stop()
+    async def test_emit_many(self, event_bus):
+        """Test emitting a batch of events."""
+        timestamp = time.time_ns()
+        received = []
+        event_bus.subscribe(MCPEventType.REQUEST_RECEIVED, lambda e: received.append(e.server_name))
+        
+        await event_bus.emit_many(
+            MCPEvent(event_type, timestamp, f"s{i}")
+            for i, event_type in enumerate([
+                MCPEventType.REQUEST_RECEIVED,
+                MCPEventType.RESPONSE_SENT,
+                MCPEventType.REQUEST_RECEIVED,
+            ])
+        )
         
-    @pytest.mark.asyncio
-    async def test_event_counts(self):
-        """Test getting event counts."""
-        bus = MockMCPEventBus()
-        await bus.start()
+        assert received == ["s0", "s2"]
+        assert event_bus.get_event_counts() == {"request_received": 2, "response_sent": 1}
         
-        # Emit various events
-        await bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, datetime.utcnow(), "s1"))
-        await bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, datetime.utcnow(), "s2"))
-        await bus.emit(MCPEvent(MCPEventType.SERVER_STOPPED, datetime.utcnow(), "s1"))
-        await bus.emit(MCPEvent(MCPEventType.SERVER_ERROR, datetime.utcnow(), "s2"))
+    async def test_event_history_is_bounded(self):
+        """Test that only the most recent events are retained."""
+        bus = MockMCPEventBus(max_events=3)
+        timestamp = time.time_ns()
+        
+        for i in range(5):
+            event_type = MCPEventType.REQUEST_RECEIVED if i % 2 else MCPEventType.RESPONSE_SENT
+            await bus.emit(MCPEvent(event_type, timestamp, f"s{i}"))
+            
+        assert [e.server_name for e in bus.get_events()] == ["s2", "s3", "s4"]
+        assert [e.server_name for e in bus.get_events(MCPEventType.RESPONSE_SENT)] == ["s2", "s4"]
+        assert [e.server_name for e in bus.get_events(MCPEventType.REQUEST_RECEIVED)] == ["s3"]
+        assert bus.get_events(MCPEventType.SERVER_ERROR) == []
+        assert bus.get_event_counts() == {"response_sent": 2, "request_received": 1}
+        
+    async def test_event_history_disabled(self):
+        """Test that max_events=0 delivers events without retaining any."""
+        bus = MockMCPEventBus(max_events=0)
+        received = []
+        bus.subscribe(MCPEventType.SERVER_STARTED, received.append)
         
-        await asyncio.sleep(0.1)
+        await bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, time.time_ns(), "s1"))
         
-        counts = bus.get_event_counts()
+        assert [e.server_name for e in received] == ["s1"]
+        assert bus.get_events() == []
+        assert bus.get_event_counts() == {}
+        
+    async def test_event_counts(self, event_bus):
+        """Test getting event counts."""
+        timestamp = time.time_ns()
+        # Emit various events
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, timestamp, "s1"))
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, timestamp, "s2"))
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_STOPPED, timestamp, "s1"))
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_ERROR, timestamp, "s2"))
+        
+        counts = event_bus.get_event_counts()
         assert counts["server_started"] == 2
         assert counts["server_stopped"] == 1
         assert counts["server_error"] == 1
         
-        await bus.stop()
+    async def test_reset(self, event_bus):
+        """Test that reset empties a running bus."""
+        event_bus.subscribe(MCPEventType.SERVER_STARTED, lambda e: None)
+        await event_bus.emit(MCPEvent(MCPEventType.SERVER_STARTED, datetime.utcnow(), "s1"))
+        
+        event_bus.reset()
+        
+        assert event_bus._running
+        assert event_bus.get_events() == []
+        assert event_bus.get_event_counts() == {}
+        assert not event_bus.subscribers
 
 
 class TestMockMCPNotificationService:
     """Test the mock MCP notification service."""
     
-    @pytest.mark.asyncio
-    async def test_server_notifications(self):
+    async def test_server_notifications(self, event_bus):
         """Test server-related notifications."""
-        bus = MockMCPEventBus()
-        await bus.start()
-        
-        service = MockMCPNotificationService(bus)
+        service = MockMCPNotificationService(event_bus)
         
         # Notify server start
         await service.notify_server_start("test-server", {"command": "test-mcp"})
@@ -230,10 +307,8 @@ class TestMockMCPNotificationService:
         # Notify server error
         await service.notify_server_error("test-server", "Connection failed")
         
-        await asyncio.sleep(0.1)
-        
         # Check events were emitted
-        events = bus.get_events()
+        events = event_bus.get_events()
         assert len(events) == 3
         
         # Check notifications were stored
@@ -242,16 +317,29 @@ class TestMockMCPNotificationService:
         assert notifications[0]["type"] == "server_start"
         assert notifications[1]["type"] == "server_stop"
         assert notifications[2]["type"] == "server_error"
-        
-        await bus.stop()
-        
-    @pytest.mark.asyncio
-    async def test_connection_notifications(self):
+
+        # Each notification carries its event's timestamp
+        assert [n["timestamp"] for n in notifications] == [e.iso for e in events]
+        
+    async def test_batched_server_start_notifications(self, event_bus):
+        """Test notifying several server starts at once."""
+        started = []
+        event_bus.subscribe(MCPEventType.SERVER_STARTED, lambda e: started.append(e.server_name))
+        service = MockMCPNotificationService(event_bus)
+        
+        await service.notify_server_start_batch({
+            "memory": {"command": "memory-mcp"},
+            "github": {"command": "github-mcp"},
+        })
+        
+        assert started == ["memory", "github"]
+        notifications = service.get_notifications("server_start")
+        assert [n["server_name"] for n in notifications] == ["memory", "github"]
+        assert notifications[1]["data"] == {"command": "github-mcp"}
+        
+    async def test_connection_notifications(self, event_bus):
         """Test connection-related notifications."""
-        bus = MockMCPEventBus()
-        await bus.start()
-        
-        service = MockMCPNotificationService(bus)
+        service = MockMCPNotificationService(event_bus)
         
         # Notify connection established
         await service.notify_connection_established("server1", "conn123")
@@ -259,23 +347,15 @@ class TestMockMCPNotificationService:
         # Notify connection lost
         await service.notify_connection_lost("server1", "conn123", "timeout")
         
-        await asyncio.sleep(0.1)
-        
         # Check notifications
         notifications = service.get_notifications()
         assert len(notifications) == 2
         assert notifications[0]["data"]["connection_id"] == "conn123"
         assert notifications[1]["data"]["reason"] == "timeout"
         
-        await bus.stop()
-        
-    @pytest.mark.asyncio
-    async def test_notification_filtering(self):
+    async def test_notification_filtering(self, event_bus):
         """Test filtering notifications by type."""
-        bus = MockMCPEventBus()
-        await bus.start()
-        
-        service = MockMCPNotificationService(bus)
+        service = MockMCPNotificationService(event_bus)
         
         # Create various notifications
         await service.notify_server_start("s1", {})
@@ -288,8 +368,6 @@ class TestMockMCPNotificationService:
         
         assert len(start_notifications) == 2
         assert len(error_notifications) == 1
-        
-        await bus.stop()
 
 
 class TestMockMCPMetricsCollector:
@@ -377,6 +455,25 @@ class TestMockMCPMetricsCollector:
         assert summary["timings"]["request_processing_time"]["count"] == 0
         assert summary["timings"]["connection_establishment_time"]["count"] == 0
         
+    def test_metrics_summary_cached(self):
+        """Test that repeated summaries are equal, independent plain dicts."""
+        collector = MockMCPMetricsCollector()
+        collector.record_request(0.1)
+        
+        summary = collector.get_metrics_summary()
+        summary["counters"]["total_requests"] = 0
+        summary["timings"]["request_processing_time"]["count"] = 0
+        again = collector.get_metrics_summary()
+        assert again["counters"]["total_requests"] == 1
+        assert again["timings"]["request_processing_time"]["count"] == 1
+        assert json.loads(json.dumps(again)) == again
+            
+        collector.record_disconnection()
+        collector.record_request(0.3)
+        updated = collector.get_metrics_summary()
+        assert updated["counters"]["total_requests"] == 2
+        assert again["counters"]["total_requests"] == 1
+        
     def test_empty_metrics_summary(self):
         """Test metrics summary with no data."""
         collector = MockMCPMetricsCollector()
@@ -2,9 +2,41 @@
 import pytest
 import json
 from pathlib import Path
+from typing import Any, Dict
 from claude_manager.models import Project
 
 
+# Raw MCP project data, in the config file's key format
+MCP_PROJECT_DATA: Dict[str, Any] = {
+    "mcpServers": {"memory": {"command": "memory-mcp"}},
+    "enabledMcpjsonServers": ["server1"],
+    "disabledMcpjsonServers": ["server2"],
+    "enableAllProjectMcpServers": False,
+    "mcpContextUris": [
+        "test://simple",
+        "file:///absolute/path",
+        "http://example.com/context",
+        "custom-protocol://complex/path/with/segments",
+        "urn:mcp:context:12345"
+    ]
+}
+
+
+def make_project(path: str = "/path/to/project", **overrides: Any) -> Project:
+    """Build a project from MCP_PROJECT_DATA with some keys replaced.
+
+    from_dict keeps references to the data's containers, so callers must
+    reassign fields rather than mutate them in place.
+    """
+    return Project.from_dict(path, {**MCP_PROJECT_DATA, **overrides})
+
+
+@pytest.fixture(scope="module")
+def mcp_project() -> Project:
+    """Project built from MCP_PROJECT_DATA, shared by the read-only tests."""
+    return make_project()
+
+
 class TestMCPModels:
     """Test MCP-related model functionality."""
     
@@ -56,25 +88,16 @@ class TestMCPModels:
         assert project.mcp_context_uris == uris
         assert len(project.mcp_context_uris) == 3
         
-    def test_project_to_dict_with_mcp(self):
+    def test_project_to_dict_with_mcp(self, mcp_project):
         """Test Project.to_dict() includes MCP fields."""
-        project = Project(
-            path="/path/to/project",
-            mcp_servers={"memory": {"command": "memory-mcp"}},
-            enabled_mcpjson_servers=["server1"],
-            disabled_mcpjson_servers=["server2"],
-            enable_all_project_mcp_servers=False,
-            mcp_context_uris=["test://uri"]
-        )
-        
-        data = project.to_dict()
+        data = mcp_project.to_dict()
         
         assert "mcpServers" in data
         assert data["mcpServers"] == {"memory": {"command": "memory-mcp"}}
         assert data["enabledMcpjsonServers"] == ["server1"]
         assert data["disabledMcpjsonServers"] == ["server2"]
         assert data["enableAllProjectMcpServers"] is False
-        assert data["mcpContextUris"] == ["test://uri"]
+        assert data["mcpContextUris"] == MCP_PROJECT_DATA["mcpContextUris"]
         
     def test_project_from_dict_with_mcp(self):
         """Test Project.from_dict() handles MCP fields."""
@@ -124,63 +147,40 @@ class TestMCPModels:
         assert data["enableAllProjectMcpServers"] is False
         assert data["mcpContextUris"] == []
         
-    def test_project_mcp_server_validation(self):
-        """Test validation of MCP server configurations."""
-        # Valid configuration
-        valid_servers = {
-            "test": {
-                "command": "test-mcp",
-                "args": ["--arg1", "value1"],
-                "env": {"KEY": "value"}
-            }
-        }
-        
+    # The model accepts invalid configurations as-is for now (a real
+    # implementation might want to add validation later)
+    @pytest.mark.parametrize("server", [
+        pytest.param({
+            "command": "test-mcp",
+            "args": ["--arg1", "value1"],
+            "env": {"KEY": "value"}
+        }, id="valid"),
+        pytest.param({}, id="empty"),  # Missing command
+        pytest.param({"command": None}, id="null_command"),
+        pytest.param({"command": "test", "args": "not-a-list"}, id="bad_args"),
+    ])
+    def test_project_mcp_server_validation(self, server):
+        """Test that MCP server configurations are stored unchanged."""
         project = Project(
             path="/test",
-            mcp_servers=valid_servers
+            mcp_servers={"test": server}
         )
         
-        assert project.mcp_servers == valid_servers
+        assert project.mcp_servers == {"test": server}
         
-        # Invalid configurations should be handled gracefully
-        # (In real implementation, might want to add validation)
-        invalid_servers = {
-            "empty": {},  # Missing command
-            "null_command": {"command": None},
-            "bad_args": {"command": "test", "args": "not-a-list"}
-        }
-        
-        # For now, the model accepts these (might want to add validation later)
-        project2 = Project(
-            path="/test2",
-            mcp_servers=invalid_servers
-        )
-        
-        assert project2.mcp_servers == invalid_servers
-        
-    def test_project_mcp_uri_formats(self):
+    @pytest.mark.parametrize("uri", MCP_PROJECT_DATA["mcpContextUris"])
+    def test_project_mcp_uri_formats(self, uri):
         """Test various MCP context URI formats."""
-        uris = [
-            "test://simple",
-            "file:///absolute/path",
-            "http://example.com/context",
-            "custom-protocol://complex/path/with/segments",
-            "urn:mcp:context:12345"
-        ]
-        
-        project = Project(
-            path="/test",
-            mcp_context_uris=uris
-        )
+        project = make_project(mcpContextUris=[uri])
         
-        assert project.mcp_context_uris == uris
-        assert all(isinstance(uri, str) for uri in project.mcp_context_uris)
+        assert project.mcp_context_uris == [uri]
+        assert project.to_dict()["mcpContextUris"] == [uri]
         
     def test_project_mcp_server_merge(self):
         """Test merging MCP server configurations."""
-        project = Project(
-            path="/test",
-            mcp_servers={
+        project = make_project(
+            "/test",
+            mcpServers={
                 "server1": {"command": "cmd1"},
                 "server2": {"command": "cmd2"}
             }
@@ -1,6 +1,7 @@
 """Unit tests for mock MCP server implementation."""
 import pytest
 import asyncio
+from typing import Any, Dict, List, Tuple, Union
 from claude_manager.tests.mcp.mocks import (
     MockMemoryMCPServer,
     MockMCPConnection,
@@ -10,10 +11,91 @@ from claude_manager.tests.mcp.mocks import (
 )
 
 
+# Request scenarios run in order against the shared memory server. Each
+# step is (method, params, expected): a dict expected is matched against
+# the result (nested dicts by subset), a string must appear in the error.
+SCENARIOS: Dict[str, List[Tuple[str, Dict[str, Any], Union[Dict[str, Any], str]]]] = {
+    "store_and_retrieve": [
+        ("store", {"key": "test-key", "value": "test-value"},
+         {"success": True, "key": "test-key"}),
+        ("retrieve", {"key": "test-key"},
+         {"success": True, "data": {"value": "test-value"}}),
+    ],
+    "list_keys": [
+        ("store", {"key": "app:config", "value": "value_app:config"}, {"success": True}),
+        ("store", {"key": "app:state", "value": "value_app:state"}, {"success": True}),
+        ("store", {"key": "user:prefs", "value": "value_user:prefs"}, {"success": True}),
+        ("store", {"key": "user:data", "value": "value_user:data"}, {"success": True}),
+        ("list", {}, {
+            "success": True,
+            "count": 4,
+            "keys": ["app:config", "app:state", "user:prefs", "user:data"],
+        }),
+        ("list", {"prefix": "app:"}, {"count": 2, "keys": ["app:config", "app:state"]}),
+    ],
+    "delete_key": [
+        ("store", {"key": "delete-me", "value": "temp"}, {"success": True}),
+        ("retrieve", {"key": "delete-me"}, {"success": True}),
+        ("delete", {"key": "delete-me"}, {"success": True}),
+        ("retrieve", {"key": "delete-me"}, {"success": False, "error": "Key not found"}),
+    ],
+    "clear_memory": [
+        *(
+            ("store", {"key": f"key{i}", "value": f"value{i}"}, {"success": True})
+            for i in range(5)
+        ),
+        ("clear", {}, "Confirmation required"),
+        ("clear", {"confirm": True}, {"success": True, "cleared": 5}),
+        ("list", {}, {"count": 0}),
+    ],
+    "server_stats": [
+        ("store", {"key": "k1", "value": "v1"}, {"success": True}),
+        ("retrieve", {"key": "k1"}, {"success": True}),
+        ("stats", {}, {
+            "success": True,
+            # Three requests (store, retrieve, stats) but only two responses:
+            # the stats response is counted after the handler reads the counter
+            "stats": {"total_keys": 1, "running": True, "request_count": 3, "response_count": 2},
+        }),
+    ],
+    "error_handling": [
+        ("invalid_method", {}, "Method not found"),
+        ("store", {"value": "no-key"}, "Key is required"),
+    ],
+}
+
+
+def _assert_matches(actual: Any, expected: Any, path: str = "result"):
+    """Assert that actual equals expected, comparing dicts by expected's keys."""
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict), f"{path}: expected a dict, got {actual!r}"
+        for key, value in expected.items():
+            assert key in actual, f"{path}: missing {key!r}"
+            _assert_matches(actual[key], value, f"{path}[{key!r}]")
+    else:
+        assert actual == expected, f"{path}: {actual!r} != {expected!r}"
+
+
+def _assert_ok(response: MCPResponse, expected: Dict[str, Any], path: str = "result"):
+    """Assert that a response has no error and its result matches expected."""
+    assert response.error is None, f"{path}: {response.error}"
+    _assert_matches(response.result, expected, path)
+
+
+# Each scenario's requests, built once at import; requests are frozen, so
+# every run can send the same objects
+_SCENARIO_REQUESTS: Dict[str, Tuple[Tuple[MCPRequest, Union[Dict[str, Any], str]], ...]] = {
+    name: tuple(
+        (MCPRequest(id=f"{name}-{i}", method=method, params=params), expected)
+        for i, (method, params, expected) in enumerate(steps)
+    )
+    for name, steps in SCENARIOS.items()
+}
+
+
 class TestMockMemoryMCPServer:
     """Test the mock Memory MCP server."""
     
-    @pytest.mark.asyncio
     async def test_server_lifecycle(self):
         """Test server start and stop."""
         server = MockMemoryMCPServer()
@@ -25,216 +107,33 @@ class TestMockMemoryMCPServer:
         await server.stop()
         assert not server.running
         
-    @pytest.mark.asyncio
-    async def test_store_and_retrieve(self):
-        """Test storing and retrieving values."""
-        server = MockMemoryMCPServer()
-        await server.start()
-        
-        # Store a value
-        store_request = MCPRequest(
-            id="req1",
-            method="store",
-            params={"key": "test-key", "value": "test-value"}
-        )
-        response = await server.handle_request(store_request)
-        
-        assert response.error is None
-        assert response.result["success"] is True
-        assert response.result["key"] == "test-key"
-        
-        # Retrieve the value
-        retrieve_request = MCPRequest(
-            id="req2",
-            method="retrieve",
-            params={"key": "test-key"}
-        )
-        response = await server.handle_request(retrieve_request)
-        
-        assert response.error is None
-        assert response.result["success"] is True
-        assert response.result["data"]["value"] == "test-value"
-        
-        await server.stop()
-        
-    @pytest.mark.asyncio
-    async def test_list_keys(self):
-        """Test listing keys with prefix filtering."""
-        server = MockMemoryMCPServer()
-        await server.start()
-        
-        # Store multiple values
-        keys = ["app:config", "app:state", "user:prefs", "user:data"]
-        for key in keys:
-            request = MCPRequest(
-                id=f"store_{key}",
-                method="store",
-                params={"key": key, "value": f"value_{key}"}
-            )
-            await server.handle_request(request)
-            
-        # List all keys
-        list_request = MCPRequest(id="list1", method="list", params={})
-        response = await server.handle_request(list_request)
-        
-        assert response.result["success"] is True
-        assert response.result["count"] == 4
-        assert set(response.result["keys"]) == set(keys)
-        
-        # List with prefix
-        list_request = MCPRequest(
-            id="list2",
-            method="list",
-            params={"prefix": "app:"}
-        )
-        response = await server.handle_request(list_request)
-        
-        assert response.result["count"] == 2
-        assert set(response.result["keys"]) == {"app:config", "app:state"}
-        
-        await server.stop()
-        
-    @pytest.mark.asyncio
-    async def test_delete_key(self):
-        """Test deleting keys."""
-        server = MockMemoryMCPServer()
-        await server.start()
-        
-        # Store a value
-        await server.handle_request(MCPRequest(
-            id="store1",
-            method="store",
-            params={"key": "delete-me", "value": "temp"}
-        ))
-        
-        # Verify it exists
-        response = await server.handle_request(MCPRequest(
-            id="check1",
-            method="retrieve",
-            params={"key": "delete-me"}
-        ))
-        assert response.result["success"] is True
-        
-        # Delete it
-        response = await server.handle_request(MCPRequest(
-            id="delete1",
-            method="delete",
-            params={"key": "delete-me"}
-        ))
-        assert response.result["success"] is True
-        
-        # Verify it's gone
-        response = await server.handle_request(MCPRequest(
-            id="check2",
-            method="retrieve",
-            params={"key": "delete-me"}
-        ))
-        assert response.result["success"] is False
-        assert response.result["error"] == "Key not found"
-        
-        await server.stop()
-        
-    @pytest.mark.asyncio
-    async def test_clear_memory(self):
-        """Test clearing all memory."""
-        server = MockMemoryMCPServer()
-        await server.start()
-        
-        # Store multiple values
-        for i in range(5):
-            await server.handle_request(MCPRequest(
-                id=f"store{i}",
-                method="store",
-                params={"key": f"key{i}", "value": f"value{i}"}
-            ))
-            
-        # Clear without confirmation (should fail)
-        response = await server.handle_request(MCPRequest(
-            id="clear1",
-            method="clear",
-            params={}
-        ))
-        assert response.error is not None
-        
-        # Clear with confirmation
-        response = await server.handle_request(MCPRequest(
-            id="clear2",
-            method="clear",
-            params={"confirm": True}
-        ))
-        assert response.result["success"] is True
-        assert response.result["cleared"] == 5
-        
-        # Verify all cleared
-        response = await server.handle_request(MCPRequest(
-            id="list1",
-            method="list",
-            params={}
-        ))
-        assert response.result["count"] == 0
-        
-        await server.stop()
-        
-    @pytest.mark.asyncio
-    async def test_server_stats(self):
-        """Test getting server statistics."""
-        server = MockMemoryMCPServer()
-        await server.start()
-        
-        # Make some requests
-        await server.handle_request(MCPRequest(
-            id="store1",
-            method="store",
-            params={"key": "k1", "value": "v1"}
-        ))
-        await server.handle_request(MCPRequest(
-            id="retrieve1",
-            method="retrieve",
-            params={"key": "k1"}
-        ))
-        
-        # Get stats
-        response = await server.handle_request(MCPRequest(
-            id="stats1",
-            method="stats",
-            params={}
-        ))
-        
-        stats = response.result["stats"]
-        assert stats["total_keys"] == 1
-        assert stats["running"] is True
-        assert stats["request_count"] == 3  # store, retrieve, stats
-        assert stats["response_count"] == 3
-        
-        await server.stop()
-        
-    @pytest.mark.asyncio
-    async def test_error_handling(self):
-        """Test error handling in mock server."""
-        server = MockMemoryMCPServer()
-        await server.start()
-        
-        # Invalid method
-        response = await server.handle_request(MCPRequest(
-            id="invalid1",
-            method="invalid_method",
-            params={}
-        ))
-        assert response.error is not None
-        assert "Method not found" in response.error["message"]
+    @pytest.mark.parametrize("scenario", list(SCENARIOS))
+    async def test_scenario(self, memory_server, scenario):
+        """Run a scenario's requests in order, checking each response."""
+        for request, expected in _SCENARIO_REQUESTS[scenario]:
+            step = f"{request.id} {request.method}"
+            response = await memory_server.handle_request(request)
+            if isinstance(expected, str):
+                assert response.error is not None, f"{step}: expected an error"
+                assert expected in response.error["message"], step
+            else:
+                _assert_ok(response, expected, step)
+        
+    async def test_traffic_logging_opt_in(self):
+        """Test that request/response logs are only kept when enabled."""
+        quiet = MockMemoryMCPServer()
+        await quiet.start()
+        await quiet.handle_request(MCPRequest(id="q1", method="list", params={}))
+        assert quiet.get_logs() == {"requests": [], "responses": []}
+        
+        logged = MockMemoryMCPServer(log_traffic=True, log_capacity=2)
+        await logged.start()
+        for i in range(3):
+            await logged.handle_request(MCPRequest(id=f"r{i}", method="list", params={}))
+        logs = logged.get_logs()
+        assert [r["id"] for r in logs["requests"]] == ["r1", "r2"]
+        assert [r["id"] for r in logs["responses"]] == ["r1", "r2"]
         
-        # Missing required parameter
-        response = await server.handle_request(MCPRequest(
-            id="invalid2",
-            method="store",
-            params={"value": "no-key"}  # Missing key
-        ))
-        assert response.error is not None
-        assert "Key is required" in response.error["message"]
-        
-        await server.stop()
-        
-    @pytest.mark.asyncio
     async def test_server_not_running(self):
         """Test handling requests when server is not running."""
         server = MockMemoryMCPServer()
@@ -248,12 +147,16 @@ class TestMockMemoryMCPServer:
         
         assert response.error is not None
         assert "Server not running" in response.error["message"]
+        
+        # Each rejection carries its own error dict
+        response.error["message"] = "changed"
+        response = await server.handle_request(MCPRequest(id="req2", method="list"))
+        assert response.error["message"] == "Server not running"
 
 
 class TestMockMCPConnection:
     """Test the mock MCP connection."""
     
-    @pytest.mark.asyncio
     async def test_connection_lifecycle(self):
         """Test connection connect and disconnect."""
         connection = MockMCPConnection()
@@ -267,45 +170,42 @@ class TestMockMCPConnection:
         await connection.disconnect()
         assert not connection.connected
         
-    @pytest.mark.asyncio
-    async def test_send_and_receive(self):
+    async def test_send_and_receive(self, memory_connection):
         """Test sending requests and receiving responses."""
-        connection = MockMCPConnection()
-        await connection.connect()
-        
         # Send request
-        request_id = await connection.send_request(
+        request_id = await memory_connection.send_request(
             "store",
             {"key": "test", "value": "data"}
         )
         assert request_id.startswith("req_")
         
         # Receive response
-        response = await connection.receive_response(request_id)
+        response = await memory_connection.receive_response(request_id)
         assert response.id == request_id
-        assert response.error is None
-        assert response.result["success"] is True
+        _assert_ok(response, {"success": True})
         
-        await connection.disconnect()
+    async def test_pipelined_requests(self, memory_connection):
+        """Test several requests in flight, answered out of order."""
+        store_id = await memory_connection.send_request("store", {"key": "k", "value": "v"})
+        list_id = await memory_connection.send_request("list", {})
         
-    @pytest.mark.asyncio
-    async def test_call_convenience_method(self):
-        """Test the call convenience method."""
-        connection = MockMCPConnection()
-        await connection.connect()
+        _assert_ok(await memory_connection.receive_response(store_id), {"key": "k"})
+        _assert_ok(await memory_connection.receive_response(list_id), {"keys": ["k"]})
+        
+        # A request id can only be answered once
+        response = await memory_connection.receive_response(store_id)
+        assert response.error["code"] == -32600
         
+    async def test_call_convenience_method(self, memory_connection):
+        """Test the call convenience method."""
         # Store value
-        result = await connection.call("store", {"key": "k", "value": "v"})
-        assert result["success"] is True
+        result = await memory_connection.call("store", {"key": "k", "value": "v"})
+        _assert_matches(result, {"success": True})
         
         # Retrieve value
-        result = await connection.call("retrieve", {"key": "k"})
-        assert result["success"] is True
-        assert result["data"]["value"] == "v"
-        
-        await connection.disconnect()
+        result = await memory_connection.call("retrieve", {"key": "k"})
+        _assert_matches(result, {"success": True, "data": {"value": "v"}})
         
-    @pytest.mark.asyncio
     async def test_connection_errors(self):
         """Test connection error handling."""
         connection = MockMCPConnection()
@@ -329,14 +229,13 @@ class TestMockMCPConnection:
 class TestMockMCPServerPool:
     """Test the mock MCP server pool."""
     
-    @pytest.mark.asyncio
-    async def test_server_pool_management(self):
+    async def test_server_pool_management(self, server_pool, pool_server):
         """Test managing multiple servers in a pool."""
-        pool = MockMCPServerPool()
+        pool = server_pool
         
         # Add servers
-        server1 = MockMemoryMCPServer("/tmp/memory1")
-        server2 = MockMemoryMCPServer("/tmp/memory2")
+        server1 = pool_server("memory1")
+        server2 = pool_server("memory2")
         
         pool.add_server("memory1", server1)
         pool.add_server("memory2", server2)
@@ -371,11 +270,10 @@ class TestMockMCPServerPool:
         assert not conn1.is_connected()
         assert not conn2.is_connected()
         
-    @pytest.mark.asyncio
-    async def test_pool_connection_reuse(self):
+    async def test_pool_connection_reuse(self, server_pool, pool_server):
         """Test that connections are reused in the pool."""
-        pool = MockMCPServerPool()
-        pool.add_server("test", MockMemoryMCPServer())
+        pool = server_pool
+        pool.add_server("test", pool_server("test"))
         
         # Get connection twice
         conn1 = await pool.get_connection("test")
@@ -384,12 +282,7 @@ class TestMockMCPServerPool:
         # Should be the same connection
         assert conn1 is conn2
         
-        await pool.stop_all()
-        
-    @pytest.mark.asyncio
-    async def test_pool_invalid_server(self):
+    async def test_pool_invalid_server(self, server_pool):
         """Test getting connection for non-existent server."""
-        pool = MockMCPServerPool()
-        
         with pytest.raises(ValueError, match="Server invalid not found"):
-            await pool.get_connection("invalid")
\ No newline at end of file
+            await server_pool.get_connection("invalid")
\ No newline at end of file
@@ -2,6 +2,7 @@
 import pytest
 import asyncio
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any
@@ -21,7 +22,6 @@ from claude_manager.tests.mcp.mocks import (
 class TestMCPWorkflows:
     """Test complex MCP workflows."""
     
-    @pytest.mark.asyncio
     async def test_project_lifecycle_workflow(self, tmp_path):
         """Test complete project lifecycle with MCP servers."""
         # Step 1: Create new project with MCP servers
@@ -77,9 +77,9 @@ class TestMCPWorkflows:
                 server_pool.add_server(server_name, server)
                 
         # Step 4: Start enabled servers
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.perf_counter()
         await server_pool.start_all()
-        startup_time = asyncio.get_event_loop().time() - start_time
+        startup_time = time.perf_counter() - start_time
         metrics.record_server_start(startup_time)
         
         for server_name in new_project.enabled_mcpjson_servers:
@@ -160,7 +160,6 @@ class TestMCPWorkflows:
         
         await event_bus.stop()
         
-    @pytest.mark.asyncio
     async def test_collaborative_mcp_workflow(self):
         """Test multiple MCP servers working together."""
         # Setup collaborative servers
@@ -231,7 +230,6 @@ class TestMCPWorkflows:
         
         await pool.stop_all()
         
-    @pytest.mark.asyncio
     async def test_mcp_failover_workflow(self):
         """Test MCP server failover and redundancy."""
         # Setup primary and backup servers
@@ -306,7 +304,6 @@ class TestMCPWorkflows:
         
         await pool.stop_all()
         
-    @pytest.mark.asyncio
     async def test_mcp_data_pipeline_workflow(self):
         """Test data processing pipeline with MCP servers."""
         # Setup pipeline servers
@@ -404,7 +401,6 @@ class TestMCPWorkflows:
         
         await pool.stop_all()
         
-    @pytest.mark.asyncio  
     async def test_mcp_monitoring_workflow(self):
         """Test MCP server monitoring and alerting workflow."""
         # Setup monitoring components
@@ -428,9 +424,9 @@ class TestMCPWorkflows:
         # Monitoring workflow
         # Step 1: Start servers with monitoring
         for name, server in servers.items():
-            start_time = asyncio.get_event_loop().time()
+            start_time = time.perf_counter()
             await server.start()
-            startup_time = asyncio.get_event_loop().time() - start_time
+            startup_time = time.perf_counter() - start_time
             
             metrics_collector.record_server_start(startup_time)
             await notification_service.notify_server_start(name, {"monitored": True})
@@ -438,9 +434,9 @@ class TestMCPWorkflows:
         # Step 2: Simulate server operations with monitoring
         connections = {}
         for name in servers:
-            conn_start = asyncio.get_event_loop().time()
+            conn_start = time.perf_counter()
             connections[name] = await pool.get_connection(name)
-            conn_time = asyncio.get_event_loop().time() - conn_start
+            conn_time = time.perf_counter() - conn_start
             metrics_collector.record_connection(conn_time)
             
         # Step 3: Perform operations and monitor performance
@@ -453,10 +449,10 @@ class TestMCPWorkflows:
         ]
         
         for server_name, method, params in operations:
-            op_start = asyncio.get_event_loop().time()
+            op_start = time.perf_counter()
             try:
                 result = await connections[server_name].call(method, params)
-                op_time = asyncio.get_event_loop().time() - op_start
+                op_time = time.perf_counter() - op_start
                 metrics_collector.record_request(op_time, success=result.get("success", False))
                 
                 # Alert on slow operations
@@ -466,7 +462,7 @@ class TestMCPWorkflows:
                         f"Slow operation: {method} took {op_time:.3f}s"
                     )
             except Exception as e:
-                op_time = asyncio.get_event_loop().time() - op_start
+                op_time = time.perf_counter() - op_start
                 metrics_collector.record_request(op_time, success=False)
                 await notification_service.notify_server_error(server_name, str(e))
                 
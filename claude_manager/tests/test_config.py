@@ -6,6 +6,8 @@ import json
 import shutil
 from typing import TYPE_CHECKING
 
+import pytest
+
 from claude_manager.config import ClaudeConfigManager
 from claude_manager.models import Project
 
@@ -29,6 +31,21 @@ class TestClaudeConfigManager:
         manager = ClaudeConfigManager(str(custom_path))
         assert manager.config_path == custom_path
 
+    def test_from_mapping(
+        self, tmp_path: Path, mock_home_dir: Path, sample_config_data: dict
+    ) -> None:
+        """Test creating a manager from already-parsed data."""
+        config_path = tmp_path / "mapped.json"
+        manager = ClaudeConfigManager.from_mapping(sample_config_data, str(config_path))
+
+        assert manager.config_data is sample_config_data
+        assert len(manager.get_projects()) == 3
+        assert not config_path.exists()
+
+        # The file is only written on save
+        assert manager.save_config(create_backup=False)
+        assert json.loads(config_path.read_text()) == sample_config_data
+
     def test_load_config_success(self, config_manager: ClaudeConfigManager) -> None:
         """Test successful config loading."""
         assert config_manager.config_data["numStartups"] == 10
@@ -47,6 +64,15 @@ class TestClaudeConfigManager:
         manager = ClaudeConfigManager(str(invalid_file))
         assert manager.load_config() is False
 
+    def test_load_config_empty_file(self, tmp_path: Path) -> None:
+        """Test loading an empty file, which cannot be memory-mapped."""
+        empty_file = tmp_path / "empty.json"
+        empty_file.write_bytes(b"")
+
+        manager = ClaudeConfigManager(str(empty_file))
+        assert manager.load_config() is False
+        assert manager.config_data == {}
+
     def test_save_config(self, config_manager: ClaudeConfigManager, tmp_path: Path) -> None:
         """Test saving configuration."""
         # Modify config
@@ -61,6 +87,35 @@ class TestClaudeConfigManager:
 
         assert saved_data["test_field"] == "test_value"
 
+    def test_save_config_with_stale_temp_file(self, config_manager: ClaudeConfigManager) -> None:
+        """Test that saving does not reuse a temp file left by another writer."""
+        stale = config_manager.config_path.with_suffix(".tmp")
+        stale.write_text("in progress elsewhere")
+
+        config_manager.config_data["numStartups"] = 42
+        assert config_manager.save_config(create_backup=False) is True
+
+        assert stale.read_text() == "in progress elsewhere"
+        assert json.loads(config_manager.config_path.read_text())["numStartups"] == 42
+        assert list(config_manager.config_path.parent.glob("*.tmp.*")) == []
+        assert config_manager.config_path.stat().st_mode & 0o777 == 0o600
+
+    def test_save_config_unchanged(self, config_manager: ClaudeConfigManager) -> None:
+        """Test that saving unchanged data leaves the file alone."""
+        config_manager.config_data["numStartups"] = 42
+        assert config_manager.save_config(create_backup=False) is True
+        saved = config_manager.config_path.stat()
+
+        assert config_manager.save_config(create_backup=True) is True
+        assert config_manager.config_path.stat().st_ino == saved.st_ino
+        assert config_manager.get_backups() == []
+
+        # A file changed behind our back is rewritten
+        content = config_manager.config_path.read_bytes()
+        config_manager.config_path.write_bytes(content.replace(b"42", b"43"))
+        assert config_manager.save_config(create_backup=False) is True
+        assert json.loads(config_manager.config_path.read_text())["numStartups"] == 42
+
     def test_save_config_with_backup(self, config_manager: ClaudeConfigManager) -> None:
         """Test saving with backup creation."""
         original_projects = len(config_manager.config_data["projects"])
@@ -92,6 +147,35 @@ class TestClaudeConfigManager:
             backup_data = json.load(f)
         assert backup_data == config_manager.config_data
 
+    def test_create_backup_unchanged_content(
+        self, config_manager: ClaudeConfigManager
+    ) -> None:
+        """Test that backing up unchanged content reuses the latest backup."""
+        first = config_manager.create_backup()
+        assert config_manager.create_backup() == first
+        assert len(config_manager.get_backups()) == 1
+
+        config_manager.config_data["numStartups"] = 11
+        config_manager.save_config(create_backup=False)
+        second = config_manager.create_backup()
+        assert second != first
+        assert len(config_manager.get_backups()) == 2
+
+    def test_create_backup_after_deleting_latest(
+        self, config_manager: ClaudeConfigManager
+    ) -> None:
+        """Test that deleting the latest backup makes the next backup copy again."""
+        first = config_manager.create_backup()
+        config_manager.config_data["numStartups"] = 11
+        config_manager.save_config(create_backup=False)
+        second = config_manager.create_backup()
+        assert config_manager.delete_backup(second) is True
+
+        third = config_manager.create_backup()
+        assert third is not None
+        assert third != first
+        assert third.read_bytes() == config_manager.config_path.read_bytes()
+
     def test_create_backup_no_config(self, tmp_path: Path) -> None:
         """Test backup creation when config doesn't exist."""
         manager = ClaudeConfigManager(str(tmp_path / "nonexistent.json"))
@@ -117,6 +201,23 @@ class TestClaudeConfigManager:
         assert "claude_20240114_120000.json" in backup_names
         assert "claude_20240110_120000.json" in backup_names
 
+    def test_backup_list_tracked(self, config_manager: ClaudeConfigManager) -> None:
+        """Test that created, cleaned and deleted backups keep the list in sync."""
+        created = []
+        for i in range(3):
+            config_manager.config_data["numStartups"] = i
+            config_manager.save_config(create_backup=False)
+            created.append(config_manager.create_backup())
+        assert config_manager.get_backups() == list(reversed(created))
+
+        assert config_manager.delete_backup(created[1]) is True
+        assert not created[1].exists()
+        assert config_manager.get_backups() == [created[2], created[0]]
+
+        config_manager._clean_old_backups(keep_count=1)
+        assert config_manager.get_backups() == [created[2]]
+        assert not created[0].exists()
+
     def test_get_projects(self, config_manager: ClaudeConfigManager) -> None:
         """Test getting projects."""
         projects = config_manager.get_projects()
@@ -133,6 +234,37 @@ class TestClaudeConfigManager:
         assert len(project1.mcp_servers) == 1
         assert project1.has_trust_dialog_accepted is True
 
+    def test_get_projects_cached(
+        self, config_manager: ClaudeConfigManager, sample_project: Project
+    ) -> None:
+        """Test that get_projects is memoized and invalidated on mutation."""
+        projects = config_manager.get_projects()
+        assert config_manager.get_projects() is projects
+
+        config_manager.update_project(sample_project)
+        updated = config_manager.get_projects()
+        assert updated is not projects
+        assert sample_project.path in updated
+
+        config_manager.remove_project(sample_project.path)
+        assert sample_project.path not in config_manager.get_projects()
+
+    def test_get_project(
+        self, config_manager: ClaudeConfigManager, sample_project: Project
+    ) -> None:
+        """Test looking up a single project."""
+        project = config_manager.get_project("/home/user/project1")
+        assert project is not None
+        assert project.history_count == 2
+        assert config_manager.get_project("/nonexistent/path") is None
+
+        # Served from the project cache once it has been built
+        projects = config_manager.get_projects()
+        assert config_manager.get_project("/home/user/project1") is projects["/home/user/project1"]
+
+        config_manager.update_project(sample_project)
+        assert config_manager.get_project(sample_project.path) == sample_project
+
     def test_remove_project(self, config_manager: ClaudeConfigManager) -> None:
         """Test removing a project."""
         # Remove existing project
@@ -161,6 +293,23 @@ class TestClaudeConfigManager:
         assert config_manager.update_project(sample_project) is True
         assert sample_project.path in config_manager.config_data["projects"]
 
+    def test_update_projects(
+        self, config_manager: ClaudeConfigManager, sample_project: Project
+    ) -> None:
+        """Test updating several projects at once."""
+        projects = config_manager.get_projects()
+        for project in projects.values():
+            project.history.clear()
+
+        assert config_manager.update_projects([*projects.values(), sample_project]) == 4
+
+        updated = config_manager.get_projects()
+        assert len(updated) == 4
+        assert all(p.history_count == 0 for p in updated.values() if p.path != sample_project.path)
+        assert config_manager.get_stats()["total_history_entries"] == 2
+
+        assert config_manager.update_projects([]) == 0
+
     def test_get_config_size(self, config_manager: ClaudeConfigManager) -> None:
         """Test getting config file size."""
         size = config_manager.get_config_size()
@@ -179,6 +328,23 @@ class TestClaudeConfigManager:
         assert stats["user_email"] == "test@example.com"
         assert stats["organization"] == "Test Organization"
 
+    def test_get_stats_after_project_changes(self, config_manager: ClaudeConfigManager) -> None:
+        """Test that statistics reflect project updates and removals."""
+        assert config_manager.get_stats()["total_history_entries"] == 3
+
+        project = config_manager.get_projects()["/home/user/project2"]
+        project.history = [{"display": "one"}, {"display": "two"}]
+        config_manager.update_project(project)
+        stats = config_manager.get_stats()
+        assert stats["total_projects"] == 3
+        assert stats["total_history_entries"] == 5
+
+        config_manager.remove_project("/home/user/project1")
+        stats = config_manager.get_stats()
+        assert stats["total_projects"] == 2
+        assert stats["total_history_entries"] == 3
+        assert stats["total_mcp_servers"] == 0
+
     def test_restore_from_backup(self, config_manager: ClaudeConfigManager) -> None:
         """Test restoring from backup."""
         # First, verify initial state
@@ -199,6 +365,39 @@ class TestClaudeConfigManager:
         # Verify restoration
         assert len(config_manager.config_data["projects"]) == initial_project_count
 
+    def test_backups_unaffected_by_save_and_restore(
+        self, config_manager: ClaudeConfigManager
+    ) -> None:
+        """Test that (possibly hardlinked) backups keep their content."""
+        first = config_manager.create_backup()
+        original = first.read_bytes()
+
+        config_manager.config_data["numStartups"] = 42
+        config_manager.save_config(create_backup=False)
+        second = config_manager.create_backup()
+        second_content = second.read_bytes()
+        assert first.read_bytes() == original
+
+        # Restoring the first backup must not overwrite the second one
+        assert config_manager.restore_from_backup(first) is True
+        assert config_manager.config_data["numStartups"] == 10
+        assert second.read_bytes() == second_content
+
+    def test_restore_from_backup_with_stale_temp_file(
+        self, config_manager: ClaudeConfigManager
+    ) -> None:
+        """Test that restoring does not reuse a temp file left by another writer."""
+        backup_path = config_manager.create_backup()
+        backup_path.chmod(0o644)
+        stale = config_manager.config_path.with_suffix(".tmp")
+        stale.write_text("in progress elsewhere")
+
+        assert config_manager.restore_from_backup(backup_path) is True
+
+        assert stale.read_text() == "in progress elsewhere"
+        assert config_manager.config_path.read_bytes() == backup_path.read_bytes()
+        assert config_manager.config_path.stat().st_mode & 0o777 == 0o600
+
     def test_restore_from_nonexistent_backup(
         self, config_manager: ClaudeConfigManager, tmp_path: Path
     ) -> None:
@@ -212,7 +411,10 @@ class TestClaudeConfigManager:
         import time
 
         backup_paths = []
-        for _i in range(3):
+        for i in range(3):
+            # Change the config so each backup has distinct content
+            config_manager.config_data["numStartups"] = i
+            config_manager.save_config(create_backup=False)
             backup_path = config_manager.create_backup()
             if backup_path:
                 backup_paths.append(backup_path)
@@ -227,3 +429,91 @@ class TestClaudeConfigManager:
         if len(backups) >= 2:
             # Since filenames include timestamps, alphabetical reverse sort should give newest first
             assert backups[0].name > backups[1].name, "Backups should be sorted most recent first"
+
+    def test_parse_agent_file(self, config_manager: ClaudeConfigManager, tmp_path: Path) -> None:
+        """Test parsing flat and non-flat agent frontmatter."""
+        flat = tmp_path / "flat.md"
+        flat.write_text(
+            "---\n"
+            "name: flat-agent\n"
+            "description: A flat agent, with commas\n"
+            "tools: Read, Write\n"
+            "neural_patterns: [systems, critical]\n"
+            "learning_enabled: true\n"
+            "---\n\nBody\n"
+        )
+        agent = config_manager._parse_agent_file(flat, "project")
+        assert agent is not None
+        assert agent.name == "flat-agent"
+        assert agent.description == "A flat agent, with commas"
+        assert agent.tools == ["Read", "Write"]
+        assert agent.neural_patterns == ["systems", "critical"]
+        assert agent.learning_enabled is True
+
+        # Block scalars are not flat and go through the YAML loader
+        nested = tmp_path / "nested.md"
+        nested.write_text("---\nname: nested\ndescription: >\n  Folded\n  text\n---\n")
+        agent = config_manager._parse_agent_file(nested, "global")
+        assert agent is not None
+        assert agent.description == "Folded text"
+        assert agent.agent_type == "global"
+
+    def test_get_agents_cached(
+        self, config_manager: ClaudeConfigManager, tmp_path: Path
+    ) -> None:
+        """Test that unchanged agent files are not re-parsed."""
+        agents_dir = tmp_path / "project" / ".claude" / "agents"
+        agents_dir.mkdir(parents=True)
+        agent_file = agents_dir / "helper.md"
+        agent_file.write_text("---\nname: helper\ndescription: first\n---\n")
+        project_path = str(tmp_path / "project")
+
+        first = config_manager.get_agents(project_path)["helper"]
+        assert config_manager.get_agents(project_path)["helper"] is first
+
+        agent_file.write_text("---\nname: helper\ndescription: second version\n---\n")
+        updated = config_manager.get_agents(project_path)["helper"]
+        assert updated is not first
+        assert updated.description == "second version"
+
+    def test_get_agents_parallel_parse(
+        self, config_manager: ClaudeConfigManager, tmp_path: Path
+    ) -> None:
+        """Test that a directory large enough for the thread pool parses every agent."""
+        agents_dir = tmp_path / "project" / ".claude" / "agents"
+        agents_dir.mkdir(parents=True)
+        for i in range(12):
+            (agents_dir / f"agent{i}.md").write_text(
+                f"---\nname: agent{i}\ndescription: number {i}\n---\n"
+            )
+        (agents_dir / "broken.md").write_text("no frontmatter here\n")
+
+        agents = config_manager.get_agents(str(tmp_path / "project"))
+        project_agents = {name: a for name, a in agents.items() if a.agent_type == "project"}
+        assert len(project_agents) == 12
+        assert project_agents["agent7"].description == "number 7"
+
+    def test_read_frontmatter_across_chunks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that frontmatter spanning several read chunks is found."""
+        from claude_manager import config as config_module
+
+        monkeypatch.setattr(config_module, "_FRONTMATTER_CHUNK", 7)
+        agent_file = tmp_path / "agent.md"
+        agent_file.write_text("---\nname: chunked\ndescription: spans chunks\n---\nBody\n")
+        assert config_module._read_frontmatter(agent_file) == (
+            "name: chunked\ndescription: spans chunks"
+        )
+
+        no_frontmatter = tmp_path / "plain.md"
+        no_frontmatter.write_text("# Just a heading\n")
+        assert config_module._read_frontmatter(no_frontmatter) is None
+
+        unterminated = tmp_path / "open.md"
+        unterminated.write_text("---\nname: never closed\n")
+        assert config_module._read_frontmatter(unterminated) is None
+
+        inline_dashes = tmp_path / "dashes.md"
+        inline_dashes.write_bytes(b"---\r\nname: a---b\r\n---\r\nBody\r\n")
+        assert config_module._read_frontmatter(inline_dashes) == "name: a---b"
@@ -62,7 +62,7 @@ class TestIntegration:
             }
 
         config_file = tmp_path / "integration_config.json"
-        config_file.write_text(json.dumps(config_data, indent=2))
+        config_file.write_bytes(json.dumps(config_data, separators=(",", ":")).encode())
         return config_file
 
     def test_full_workflow(self, full_config_file: Path, tmp_path: Path) -> None:
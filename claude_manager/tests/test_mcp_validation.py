@@ -145,6 +145,16 @@ class TestMCPValidator:
         unknown_template = MCPValidator.get_template("unknown")
         assert unknown_template is None
     
+    def test_get_template_returns_copy(self):
+        """Test that editing a template doesn't affect later calls."""
+        template = MCPValidator.get_template("filesystem")
+        template["args"].append("/extra")
+        template["env"]["WORKSPACE_DIR"] = "/changed"
+        
+        fresh = MCPValidator.get_template("filesystem")
+        assert "/extra" not in fresh["args"]
+        assert fresh["env"]["WORKSPACE_DIR"] == "/path/to/workspace"
+    
     def test_list_templates(self):
         """Test listing available templates."""
         templates = MCPValidator.list_templates()
@@ -5,6 +5,9 @@ from __future__ import annotations
 import json
 from typing import TYPE_CHECKING, Any
 
+import pytest
+
+from claude_manager import models
 from claude_manager.models import Project
 
 if TYPE_CHECKING:
@@ -62,6 +65,21 @@ class TestProject:
         new_size = sample_project.get_size_estimate()
         assert new_size > original_size
 
+    def test_get_size_estimate_without_orjson(
+        self, sample_project: Project, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the estimate doesn't depend on orjson being installed."""
+        sample_project.history.append({"display": "café ✓", "pastedContents": {}})
+        expected = len(
+            json.dumps(
+                sample_project.to_dict(), separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+        )
+        assert sample_project.get_size_estimate() == expected
+
+        monkeypatch.setattr(models, "orjson", None)
+        assert sample_project.get_size_estimate() == expected
+
     def test_to_dict(self, sample_project: Project) -> None:
         """Test to_dict method."""
         data = sample_project.to_dict()
@@ -0,0 +1,173 @@
+"""Tests for the terminal utilities module."""
+
+from __future__ import annotations
+
+import io
+import os
+import signal
+from typing import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+from claude_manager import terminal_utils
+from claude_manager.terminal_utils import (
+    _RESET_BLOB,
+    TerminalManager,
+    _CleanupState,
+    _exit_cleanup,
+    _force_reset_terminal,
+    _register_cleanup_handlers,
+    _write_to_terminal,
+    emergency_terminal_cleanup,
+    reset_tty_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_terminal_state(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Give each test empty probe caches and unset cleanup flags."""
+    monkeypatch.setattr(terminal_utils, "_cleanup_state", _CleanupState())
+    reset_tty_cache()
+    yield
+    reset_tty_cache()
+
+
+class TestWriteToTerminal:
+    """Test raw writes to stdout."""
+
+    def test_write_to_file_descriptor(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a stdout with a real descriptor is written with os.write."""
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd, "rb") as reader, os.fdopen(write_fd, "w") as stdout:
+            monkeypatch.setattr("sys.stdout", stdout)
+            _write_to_terminal(_RESET_BLOB)
+            stdout.close()
+            assert reader.read() == _RESET_BLOB
+
+    def test_write_without_file_descriptor(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a stdout without a descriptor gets the bytes on its buffer."""
+        stdout = io.TextIOWrapper(io.BytesIO())
+        monkeypatch.setattr("sys.stdout", stdout)
+
+        _write_to_terminal(_RESET_BLOB)
+
+        assert stdout.buffer.getvalue() == _RESET_BLOB
+
+    def test_write_without_buffer(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a text-only stdout gets the sequences as text."""
+        stdout = io.StringIO()
+        monkeypatch.setattr("sys.stdout", stdout)
+
+        _write_to_terminal(_RESET_BLOB)
+
+        assert stdout.getvalue() == _RESET_BLOB.decode("ascii")
+
+    def test_force_reset_skips_non_tty(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the reset is not written when stdout is not a terminal."""
+        stdout = io.StringIO()
+        monkeypatch.setattr("sys.stdout", stdout)
+
+        assert _force_reset_terminal() is False
+        assert stdout.getvalue() == ""
+
+    def test_reset_tty_cache(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that cached stdout checks are only refreshed by reset_tty_cache."""
+        tty = Mock(isatty=Mock(return_value=True))
+        monkeypatch.setattr("sys.stdout", tty)
+        assert terminal_utils._stdout_is_tty() is True
+
+        monkeypatch.setattr("sys.stdout", io.StringIO())
+        assert terminal_utils._stdout_is_tty() is True
+
+        reset_tty_cache()
+        assert terminal_utils._stdout_is_tty() is False
+
+
+class TestCleanupHandlers:
+    """Test installation of the process-wide cleanup handlers."""
+
+    @pytest.fixture
+    def registrations(self, monkeypatch: pytest.MonkeyPatch) -> tuple[Mock, Mock]:
+        """Record atexit and signal registrations instead of installing them."""
+        register = Mock()
+        set_signal = Mock()
+        monkeypatch.setattr("atexit.register", register)
+        monkeypatch.setattr("signal.signal", set_signal)
+        return register, set_signal
+
+    def test_handlers_registered_once(self, registrations: tuple[Mock, Mock]) -> None:
+        """Test that repeated registration installs the handlers only once."""
+        register, set_signal = registrations
+
+        _register_cleanup_handlers()
+        _register_cleanup_handlers()
+
+        register.assert_called_once_with(_exit_cleanup)
+        assert [c.args[0] for c in set_signal.call_args_list] == [
+            signal.SIGINT,
+            signal.SIGTERM,
+        ]
+
+    def test_manager_skips_registration_without_tty(
+        self, registrations: tuple[Mock, Mock], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that piped output installs no handlers."""
+        register, set_signal = registrations
+        monkeypatch.setattr("sys.stdout", io.StringIO())
+
+        with TerminalManager():
+            pass
+
+        register.assert_not_called()
+        set_signal.assert_not_called()
+
+    @pytest.mark.parametrize(("reset_ok", "escalated"), [(True, False), (False, True)])
+    def test_exit_cleanup_escalates_on_failure(
+        self, monkeypatch: pytest.MonkeyPatch, reset_ok: bool, escalated: bool
+    ) -> None:
+        """Test that emergency cleanup only runs when the normal reset fails."""
+        emergency = Mock()
+        monkeypatch.setattr(terminal_utils, "_force_reset_terminal", Mock(return_value=reset_ok))
+        monkeypatch.setattr(terminal_utils, "emergency_terminal_cleanup", emergency)
+
+        _exit_cleanup()
+
+        assert emergency.called is escalated
+
+
+class TestEmergencyCleanup:
+    """Test the emergency terminal cleanup."""
+
+    def test_second_call_is_noop(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that only the first emergency cleanup writes anything."""
+        write = Mock()
+        monkeypatch.setattr(terminal_utils, "_write_to_terminal", write)
+
+        emergency_terminal_cleanup()
+        emergency_terminal_cleanup()
+
+        write.assert_called_once_with(_RESET_BLOB)
+
+    def test_falls_back_to_reset_command(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that reset(1) runs when the sequences cannot be written."""
+        run = Mock()
+        monkeypatch.setattr(terminal_utils, "_write_to_terminal", Mock(side_effect=OSError))
+        monkeypatch.setattr(terminal_utils, "_reset_command", Mock(return_value=["reset"]))
+        monkeypatch.setattr("subprocess.run", run)
+
+        emergency_terminal_cleanup()
+
+        run.assert_called_once()
+        assert run.call_args.args[0] == ["reset"]
+
+    def test_no_reset_command_available(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that nothing is run when no reset command exists."""
+        run = Mock()
+        monkeypatch.setattr(terminal_utils, "_write_to_terminal", Mock(side_effect=OSError))
+        monkeypatch.setattr(terminal_utils, "_reset_command", Mock(return_value=None))
+        monkeypatch.setattr("subprocess.run", run)
+
+        emergency_terminal_cleanup()
+
+        run.assert_not_called()
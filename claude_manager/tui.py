@@ -974,12 +974,11 @@ class BackupManagementScreen(Screen[None]):
 
     def _do_delete(self, backup_path: Path) -> None:
         """Actually delete the backup."""
-        try:
-            backup_path.unlink()
+        if self.config_manager.delete_backup(backup_path):
             self.notify(f"Deleted {backup_path.name}", severity="information")
             self.refresh_backups()
-        except Exception as e:
-            self.notify(f"Failed to delete: {e}", severity="error")
+        else:
+            self.notify(f"Failed to delete: {backup_path.name}", severity="error")
 
 
 class AgentListScreen(Screen[None]):
@@ -631,7 +631,7 @@ class ClaudeProjectManagerUI:
                     # Clear history
                     for project in projects_with_history.values():
                         project.history.clear()
-                        self.config_manager.update_project(project)
+                    self.config_manager.update_projects(projects_with_history.values())
 
                     if self.config_manager.save_config(create_backup=False):
                         console.print(f"\n[green]Cleared {total_entries} history entries.[/green]")
@@ -655,7 +655,9 @@ class ClaudeProjectManagerUI:
                         project = projects_with_history[path]
                         cleared += project.history_count
                         project.history.clear()
-                        self.config_manager.update_project(project)
+                    self.config_manager.update_projects(
+                        projects_with_history[path] for path in selected
+                    )
 
                     if self.config_manager.save_config(create_backup=False):
                         console.print(f"\n[green]Cleared {cleared} history entries.[/green]")
@@ -675,10 +677,12 @@ class ClaudeProjectManagerUI:
                 backup_path = self.config_manager.create_backup()
 
                 if backup_path:
-                    for project in projects_with_history.values():
-                        if project.history_count > keep_count:
-                            project.history = project.history[-keep_count:]
-                            self.config_manager.update_project(project)
+                    trimmed = [
+                        p for p in projects_with_history.values() if p.history_count > keep_count
+                    ]
+                    for project in trimmed:
+                        project.history = project.history[-keep_count:]
+                    self.config_manager.update_projects(trimmed)
 
                     if self.config_manager.save_config(create_backup=False):
                         console.print(
@@ -766,9 +770,11 @@ class ClaudeProjectManagerUI:
                 to_delete = len(backup_files) - keep_count
 
                 if Confirm.ask(f"Delete {to_delete} old backup(s)?"):
-                    for backup in backup_files[:-keep_count]:
-                        backup.unlink()
-                    console.print(f"\n[green]Deleted {to_delete} old backup(s).[/green]")
+                    deleted = sum(
+                        self.config_manager.delete_backup(backup)
+                        for backup in backup_files[:-keep_count]
+                    )
+                    console.print(f"\n[green]Deleted {deleted} old backup(s).[/green]")
 
     def show_config_info(self) -> None:
         """Show configuration statistics and information."""